@@ -1,6 +1,15 @@
 import tokenize
 import io
 import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# 增量清单：记录每个源文件内容哈希，内容与清洗逻辑均未变化时跳过
+MANIFEST_NAME = ".clean_manifest.json"
+
 
 def is_docstring(prev_tok, tok):
     """
@@ -16,20 +25,9 @@ def is_docstring(prev_tok, tok):
     return False
 
 
-def remove_comments_and_docstring(code):
-    """
-    处理内容：
-    - 移除所有 # 注释
-    - 移除 docstring（模块/类/函数开头的 STRING）
-    - 保留变量多行字符串
-    - 删除所有空行（无论原始是否存在）
-    """
-    result = []
-    code_bytes = io.BytesIO(code.encode("utf-8"))
-
+def _filter_tokens(tokens):
+    """逐个产出保留的 (type, string)，不物化完整 token 列表"""
     prev_tok = None
-    tokens = list(tokenize.tokenize(code_bytes.readline))
-
     for tok in tokens:
         if tok.type == tokenize.COMMENT:
             continue
@@ -39,20 +37,47 @@ def remove_comments_and_docstring(code):
                 prev_tok = tok
                 continue
 
-        result.append((tok.type, tok.string))
+        yield tok.type, tok.string
         prev_tok = tok
 
-    cleaned = tokenize.untokenize(result).decode("utf-8")
+
+def remove_comments_and_docstring(code):
+    """
+    处理内容：
+    - 移除所有 # 注释
+    - 移除 docstring（模块/类/函数开头的 STRING）
+    - 保留变量多行字符串
+    - 删除所有空行（无论原始是否存在）
+    """
+    if isinstance(code, str):
+        code = code.encode("utf-8")
+    code_bytes = io.BytesIO(code)
+
+    # tokenize 与 untokenize 之间以生成器串联，流式处理
+    cleaned = tokenize.untokenize(_filter_tokens(tokenize.tokenize(code_bytes.readline))).decode("utf-8")
 
     # 删除所有空行
     return "\n".join(line for line in cleaned.splitlines() if line.strip())
 
 
-def process_file(in_file, out_file):
-    """处理单文件：读取 → 清洗 → 写入"""
-    with open(in_file, "r", encoding="utf-8") as f:
+def _tool_hash():
+    """清洗脚本自身的哈希：脚本变化时全部重新处理"""
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def process_file(in_file, out_file, known_hash=None):
+    """
+    处理单文件：读取 → 清洗 → 写入
+    内容哈希与 known_hash 相同且输出已存在时跳过，返回 (内容哈希, 是否处理)
+    """
+    with open(in_file, "rb") as f:
         code = f.read()
 
+    digest = hashlib.sha256(code).hexdigest()
+    if digest == known_hash and os.path.exists(out_file):
+        return digest, False
+
     new_code = remove_comments_and_docstring(code)
 
     # 输出目录不存在则创建
@@ -60,13 +85,41 @@ def process_file(in_file, out_file):
 
     with open(out_file, "w", encoding="utf-8") as f:
         f.write(new_code)
+    return digest, True
 
 
-def process_directory_recursive(src_root, out_root, exclude_suffixes):
-    """
-    递归扫描 src_root 下所有文件与目录
-    按相同路径结构输出到 out_root
-    """
+def _process_task(task):
+    """进程池任务：返回 (相对路径, 输入, 输出, 哈希, 是否处理, 错误信息)"""
+    rel_path, abs_in_path, abs_out_path, known_hash = task
+    try:
+        digest, processed = process_file(abs_in_path, abs_out_path, known_hash)
+        return rel_path, abs_in_path, abs_out_path, digest, processed, None
+    except (SyntaxError, tokenize.TokenError, UnicodeDecodeError, OSError) as e:
+        return rel_path, abs_in_path, abs_out_path, None, False, str(e)
+
+
+def load_manifest(out_root):
+    """读取增量清单，清洗脚本变化或清单损坏时返回空清单"""
+    path = os.path.join(out_root, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("tool") != _tool_hash():
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(out_root, files):
+    os.makedirs(out_root, exist_ok=True)
+    path = os.path.join(out_root, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"tool": _tool_hash(), "files": files}, f, indent=0, sort_keys=True)
+    os.replace(path + ".tmp", path)  # 原子替换，中断时不留下半截清单
+
+
+def _iter_tasks(src_root, out_root, exclude_suffixes, manifest):
     for root, dirs, files in os.walk(src_root):
         for filename in files:
             if any(filename.endswith(s) for s in exclude_suffixes):
@@ -80,10 +133,48 @@ def process_directory_recursive(src_root, out_root, exclude_suffixes):
                 rel_path = os.path.relpath(abs_in_path, src_root)
 
                 # 输出路径镜像到 output 目录
-                abs_out_path = os.path.join(out_root, rel_path.replace(".py", ".py"))
+                abs_out_path = os.path.join(out_root, rel_path)
+
+                yield rel_path, abs_in_path, abs_out_path, manifest.get(rel_path)
+
 
-                process_file(abs_in_path, abs_out_path)
+def process_directory_recursive(src_root, out_root, exclude_suffixes, workers=1, incremental=True):
+    """
+    递归扫描 src_root 下所有文件与目录
+    按相同路径结构输出到 out_root
+    workers > 1 时使用进程池并行处理；incremental 为 True 时跳过内容未变化的文件
+    返回 (处理数, 跳过数, 失败数)
+    """
+    manifest = load_manifest(out_root) if incremental else {}
+    tasks = _iter_tasks(src_root, out_root, exclude_suffixes, manifest)
+    new_manifest = {}
+    processed = skipped = failed = 0
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_process_task, tasks, chunksize=16)
+    else:
+        executor = None
+        results = map(_process_task, tasks)
+
+    try:
+        for rel_path, abs_in_path, abs_out_path, digest, done, error in results:
+            if error:
+                failed += 1
+                print(f"失败: {abs_in_path}: {error}")
+                continue
+            new_manifest[rel_path] = digest
+            if done:
+                processed += 1
                 print(f"{abs_in_path} -> {abs_out_path}")
+            else:
+                skipped += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    save_manifest(out_root, new_manifest)
+    return processed, skipped, failed
 
 
 if __name__ == "__main__":
@@ -93,13 +184,17 @@ if __name__ == "__main__":
     # scripts 上一层目录，即 project_root
     project_root = os.path.dirname(script_dir)
 
-    # 指向与 scripts 同级的 src
-    target_dir = os.path.join(project_root, "src")
-
-    # 输出目录 scripts/output
-    output_dir = os.path.join(project_root, "output\\clean_code_comments")
-
+    parser = argparse.ArgumentParser(description="移除 Python 源码中的注释与 docstring")
+    # 默认指向与 scripts 同级的 src
+    parser.add_argument("--src", default=os.path.join(project_root, "src"), help="源码目录")
+    # 默认输出目录 output/clean_code_comments
+    parser.add_argument("--out", default=os.path.join(project_root, "output", "clean_code_comments"), help="输出目录")
     # 添加要排除的文件
-    exclude = []
-
-    process_directory_recursive(target_dir, output_dir, exclude)
+    parser.add_argument("--exclude", action="append", default=[], help="排除的文件后缀，可重复")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数，1 为串行")
+    parser.add_argument("--full", action="store_true", help="忽略增量清单，全部重新处理")
+    args = parser.parse_args()
+
+    counts = process_directory_recursive(args.src, args.out, args.exclude, args.workers, not args.full)
+    print(f"处理 {counts[0]}，跳过(未变化) {counts[1]}，失败 {counts[2]}")
+    sys.exit(1 if counts[2] else 0)
@@ -6,10 +6,42 @@ Date: {{ cookiecutter.date }}
 Description: API interfaces for core functions
 """
 
+import os
+import hashlib
+from typing import Any, Dict
+
 from core.core import *
 
+DEFAULT_API_PATH = "/api/fastdem/v1"
 
 
 def core_init():
-    authorized = quick_check("/api/fastdem/v1")
-    print(f"{api} -> {'✅ 已授权' if authorized else '❌ 未授权'}")
\ No newline at end of file
+    api_path = DEFAULT_API_PATH
+    authorized = quick_check(api_path)
+    print(f"{api_path} -> {'✅ 已授权' if authorized else '❌ 未授权'}")
+
+
+def authorize(api_path: str = DEFAULT_API_PATH) -> bool:
+    """授权检查（批处理中每个工作进程调用一次）"""
+    return quick_check(api_path)
+
+
+def process_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    批处理单元：处理一个工作项并返回结果（示例实现，替换为实际业务逻辑）
+
+    Args:
+        item: 工作项，文件输入为 {"path": ...}，JSONL 输入为该行的 JSON 对象
+
+    Returns:
+        结果字典，需可 JSON 序列化
+    """
+    path = item.get("path")
+    if not path:
+        return {**item, "status": "ok"}
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return {"path": path, "size": os.path.getsize(path), "sha256": digest.hexdigest(), "status": "ok"}
\ No newline at end of file
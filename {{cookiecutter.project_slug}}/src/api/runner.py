@@ -0,0 +1,184 @@
+"""
+File: runner.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Parallel batch job runner for api functions across processes
+
+工作项来源：目录（逐个文件）、.jsonl（每行一个 JSON 对象）、文本文件（每行一个路径），或 '-' 表示标准输入。
+结果以 JSONL 流式写出，可按输入顺序或按完成顺序输出。
+授权检查在每个工作进程启动时执行一次（进程池 initializer），而不是每个工作项一次。
+"""
+
+import os
+import sys
+import json
+import time
+import importlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_FUNC = "api.api:process_item"
+DEFAULT_AUTH = "api.api:authorize"
+
+# 工作进程内状态，由 _init_worker 设置
+_worker_func: Optional[Callable[[Dict[str, Any]], Any]] = None
+_worker_authorized = False
+
+
+def _resolve(spec: str) -> Callable:
+    """'module:attr' -> callable"""
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _init_worker(func_spec: str, auth_spec: Optional[str], api_path: Optional[str]) -> None:
+    """Worker initializer: resolve the task function and check authorization once. 每个工作进程执行一次"""
+    global _worker_func, _worker_authorized
+    _worker_func = _resolve(func_spec)
+    if auth_spec is None:
+        _worker_authorized = True
+    else:
+        auth = _resolve(auth_spec)
+        _worker_authorized = bool(auth(api_path) if api_path else auth())
+
+
+def _run_chunk(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Process a chunk of items; per-item errors are returned, not raised. 处理一块工作项，单项异常记录在结果中"""
+    if not _worker_authorized:
+        raise PermissionError(f"API未授权，工作进程 {os.getpid()} 拒绝执行")
+    results = []
+    for item in items:
+        try:
+            results.append({"result": _worker_func(item)})
+        except Exception as e:
+            results.append({"item": item, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def read_items(source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read work items from a directory, .jsonl file, path-list file or stdin ('-').
+    惰性读取工作项
+    """
+    if source != "-" and os.path.isdir(source):
+        from utils.helpers import iter_files
+        for path in iter_files(source, absolute=True):
+            yield {"path": path}
+        return
+
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        is_jsonl = source.endswith(".jsonl")
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl or line.startswith("{"):
+                yield json.loads(line)
+            else:
+                yield {"path": line}
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_jobs(
+    items: Iterable[Dict[str, Any]],
+    output,
+    func: str = DEFAULT_FUNC,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    ordered: bool = True,
+    auth: Optional[str] = DEFAULT_AUTH,
+    api_path: Optional[str] = None,
+    progress_every: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    分发工作项到进程池并流式写出结果
+
+    Args:
+        items: 工作项可迭代对象（按块惰性消费，内存中最多约 4 * workers 个块）
+        output: 文本输出流，每个结果写一行 JSON
+        func: 'module:attr' 形式的处理函数，需在子进程中可导入
+        workers: 进程数，默认 CPU 核数
+        chunk_size: 每个任务包含的工作项数量，减少进程间通信开销
+        ordered: True 按输入顺序输出；False 按完成顺序输出（吞吐更稳定）
+        auth: 'module:attr' 形式的授权检查函数，None 表示不检查
+        api_path: 传给授权检查函数的 API 路径，None 使用其默认值
+        progress_every: 大于 0 时每隔该秒数向 stderr 输出进度
+
+    Returns:
+        统计信息：items / errors / elapsed_s / items_per_s / workers
+
+    Raises:
+        PermissionError: 工作进程授权检查失败，已取消尚未开始的块
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4
+    it = iter(items)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+    stats = {"items": 0, "errors": 0}
+    start = last_report = time.perf_counter()
+
+    def _write(results: List[Dict[str, Any]]) -> None:
+        nonlocal last_report
+        for entry in results:
+            if "error" in entry:
+                stats["errors"] += 1
+                output.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            else:
+                output.write(json.dumps(entry["result"], ensure_ascii=False) + "\n")
+        stats["items"] += len(results)
+        if progress_every and time.perf_counter() - last_report >= progress_every:
+            last_report = time.perf_counter()
+            rate = stats["items"] / (last_report - start)
+            print(f"[RUNNER] {stats['items']} items, {stats['errors']} errors, {rate:.1f} items/s", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(func, auth, api_path)) as executor:
+        try:
+            if ordered:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(_run_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        _write(pending.popleft().result())
+                while pending:
+                    _write(pending.popleft().result())
+            else:
+                pending = set()
+                for chunk in chunks:
+                    pending.add(executor.submit(_run_chunk, chunk))
+                    while len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _write(future.result())
+                for future in wait(pending).done:
+                    _write(future.result())
+        except BaseException:
+            # 授权失败（PermissionError）或中断时取消排队中的块，不再继续处理剩余工作项
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+    elapsed = time.perf_counter() - start
+    return {
+        **stats,
+        "elapsed_s": elapsed,
+        "items_per_s": stats["items"] / elapsed if elapsed else 0.0,
+        "workers": workers,
+    }
+
+
+def run_file(
+    source: str,
+    output_path: str,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """从 source 读取工作项，结果写入 output_path（'-' 为标准输出）"""
+    if output_path == "-":
+        return run_jobs(read_items(source), sys.stdout, **kwargs)
+    with open(output_path, "w", encoding="utf-8") as output:
+        return run_jobs(read_items(source), output, **kwargs)
@@ -6,7 +6,9 @@ Date: {{ cookiecutter.date }}
 Description: Main Config
 """
 from loguru import logger
+import os
 import sys
+import base64
 
 # ------------------------------------------
 # Unified Logger for mytool
@@ -15,7 +17,11 @@ import sys
 logger.remove()  # Remove default handler
 logger.add(sys.stdout, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", level="INFO")
 logger.add("logs/{{cookiecutter.project_slug}}.log", rotation="10 MB", retention="7 days", encoding="utf-8")  # File logging
+if os.environ.get("LOG_JSONL", "0") == "1":  # 结构化日志，供 `main.py logs index/query` 建索引查询
+    from utils.logindex import add_jsonl_sink
+    add_jsonl_sink(logger, "logs/{{cookiecutter.project_slug}}.jsonl", rotation="10 MB", retention="7 days")
 
 # Now you can import this logger in all modules
 # AES-256 key (32 bytes)
-KEY = base64.b64decode(b"AABAA0AgIAAAAEAIADbCQAA3AAAAGBgAAABACAA8wYAALcKAABAQAAAAQAgAK8EAACqEQAAMDAAAAEAIADSAwAAWRYAACgoAAABACAAIgMAACsaAAAgIAAAAQAgAM4CAABNHQAAGBgAAAEAIABPAgAAGyAAABYWAAABACAADAIAAGoiAAAUFAAAAQAgAO8BAAB2JAAAEBAAAAEAIACxAQAAZSYAAA4OAAABACAAdwEAABYoAAAKCgAAAQAgADoBAACNKQAACAgAAAEAIAACAQAAxyoAAAAAAAAAAIlQTkcNChoKAAAADUlIRFIAAACAAAAAgAgGAAAAwz5hywAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADsMAAA7DAcdvqGQAAAl9SURBVHhe7Z19jFxlFcZba6PYCtqiQIh8JCRAREC3RlvQlcCuk")[:32]  # 例如: 32字节的AES密钥
\ No newline at end of file
+KEY = base64.b64decode(b"AABAA0AgIAAAAEAIADbCQAA3AAAAGBgAAABACAA8wYAALcKAABAQAAAAQAgAK8EAACqEQAAMDAAAAEAIADSAwAAWRYAACgoAAABACAAIgMAACsaAAAgIAAAAQAgAM4CAABNHQAAGBgAAAEAIABPAgAAGyAAABYWAAABACAADAIAAGoiAAAUFAAAAQAgAO8BAAB2JAAAEBAAAAEAIACxAQAAZSYAAA4OAAABACAAdwEAABYoAAAKCgAAAQAgADoBAACNKQAACAgAAAEAIAACAQAAxyoAAAAAAAAAAIlQTkcNChoKAAAADUlIRFIAAACAAAAAgAgGAAAAwz5hywAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADsMAAA7DAcdvqGQAAAl9SURBVHhe7Z19jFxlFcZba6PYCtqiQIh8JCRAREC3RlvQlcCuk")[:32]  # 例如: 32字节的AES密钥
+AES_KEY = KEY  # utils.helpers 中 AES 加解密使用的名字
@@ -1,3 +1,4 @@
+# cython: binding=True
 # auth_client.py
 """
 File: auth_client.py
@@ -7,23 +8,39 @@ Date: {{ cookiecutter.date }}
 Description: LanAuthGate API授权检查客户端 | 提供简单的Python接口来检查API授权状态
 """
 
+import time
 import requests
 import logging
+from http.client import responses as HTTP_REASONS
 from typing import Dict, Any, Optional
 
+from utils import tracing
+from utils.metrics import REGISTRY
+from .auth_transport import CHECK_ROUTE, CHECK_GET_ROUTE, LIST_ROUTE, make_transport
+
+_REQUESTS = REGISTRY.counter("auth_requests_total", "AuthClient checks by method and result", ["method", "result"])
+_DURATION = REGISTRY.histogram("auth_request_duration_seconds", "AuthClient check latency", ["method"])
+
 
 class AuthClient:
     """API授权检查客户端"""
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", transport=None, rate_limiter=None):
         """
         初始化授权客户端
 
         Args:
-            base_url: LanAuthGate服务地址
+            base_url: LanAuthGate服务地址，http(s)://host:port 或 unix:///path/to.sock
+            transport: 自定义传输（见 core.auth_transport），优先于 base_url；
+                非 TCP 传输没有 requests.Session，self.session 为 None
+            rate_limiter: 出站请求限流器（如 decorators.rate_limit.RateLimiter），平滑对授权服务的突发请求
         """
-        self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        self.rate_limiter = rate_limiter
+        self.transport = transport if transport is not None else make_transport(base_url)
+        self.base_url = self.transport.base_url if transport is not None else base_url.rstrip('/')
+        # TCP 传输（默认）下为该传输使用的 requests.Session，可挂载连接池适配器、设置请求头；
+        # Unix 域套接字与进程内传输不经过 requests，session 为 None
+        self.session = getattr(self.transport, "session", None)
         # 设置请求超时
         self.timeout = 10
 
@@ -48,6 +65,7 @@ class AuthClient:
         Raises:
             requests.RequestException: 网络请求错误
             ValueError: 参数错误
+            RateLimitExceeded: 被限流器拒绝，异常带有 rate_limited = True 属性
         """
         if not api_path:
             raise ValueError("API路径不能为空")
@@ -58,51 +76,79 @@ class AuthClient:
 
         self.logger.info(f"检查API授权: {api_path}")
 
-        try:
-            if method.lower() == 'post':
-                return self._check_auth_post(api_path)
-            elif method.lower() == 'get':
-                return self._check_auth_get(api_path)
-            else:
-                raise ValueError("method参数必须是 'post' 或 'get'")
-
-        except requests.RequestException as e:
-            self.logger.error(f"授权检查请求失败: {e}")
-            raise
+        method = method.lower()
+        with tracing.span("AuthClient.check_auth", "auth", api_path=api_path, method=method,
+                          transport=type(self.transport).__name__) as trace_span:
+            limiter = self.rate_limiter
+            if limiter is not None:
+                try:
+                    limiter.acquire()
+                except RuntimeError as e:  # RateLimitExceeded：非阻塞拒绝或等待超时；共享状态文件的 OSError 等原样抛出
+                    # 在异常上标记，is_authorized 据此识别限流，不依赖异常类的导入路径（src.decorators 与 decorators 是两个类）
+                    e.rate_limited = True
+                    _REQUESTS.labels(method, "rate_limited").inc()
+                    self.logger.warning(f"授权检查被限流: {e}")
+                    raise
+            start = time.perf_counter()
+            try:
+                if method == 'post':
+                    result = self._check_auth_post(api_path)
+                elif method == 'get':
+                    result = self._check_auth_get(api_path)
+                else:
+                    raise ValueError("method参数必须是 'post' 或 'get'")
+
+            except requests.RequestException as e:
+                _REQUESTS.labels(method, "error").inc()
+                _DURATION.labels(method).observe(time.perf_counter() - start)
+                self.logger.error(f"授权检查请求失败: {e}")
+                raise
+            finally:
+                if limiter is not None:
+                    limiter.release()
+
+            authorized = result.get('authorized', False)
+            trace_span.set(authorized=authorized)
+            _REQUESTS.labels(method, "authorized" if authorized else "denied").inc()
+            _DURATION.labels(method).observe(time.perf_counter() - start)
+            return result
 
     def _check_auth_post(self, api_path: str) -> Dict[str, Any]:
         """使用POST方法检查授权"""
-        url = f"{self.base_url}/api/auth/check"
         payload = {"api_path": api_path}
 
-        response = self.session.post(
-            url,
-            json=payload,
-            timeout=self.timeout,
-            headers={'Content-Type': 'application/json'}
-        )
-        response.raise_for_status()
+        status, result = self.transport.request("POST", CHECK_ROUTE, payload=payload, timeout=self.timeout)
+        self._raise_for_status(status, CHECK_ROUTE)
 
-        result = response.json()
         self.logger.info(f"授权检查结果: {api_path} -> {result.get('authorized', False)}")
         return result
 
     def _check_auth_get(self, api_path: str) -> Dict[str, Any]:
         """使用GET方法检查授权"""
-        url = f"{self.base_url}/api/auth/check/get"
         params = {"path": api_path}
 
-        response = self.session.get(
-            url,
-            params=params,
-            timeout=self.timeout
-        )
-        response.raise_for_status()
+        status, result = self.transport.request("GET", CHECK_GET_ROUTE, params=params, timeout=self.timeout)
+        self._raise_for_status(status, CHECK_GET_ROUTE)
 
-        result = response.json()
         self.logger.info(f"授权检查结果: {api_path} -> {result.get('authorized', False)}")
         return result
 
+    def _raise_for_status(self, status: int, route: str) -> None:
+        """
+        与 requests.Response.raise_for_status 一致：4xx/5xx 抛出 HTTPError
+
+        所有传输都只返回状态码，这里构造 requests.Response 挂到异常上，
+        调用方仍可读取 e.response.status_code / e.response.url
+        """
+        if status >= 400:
+            response = requests.Response()
+            response.status_code = status
+            response.url = self.base_url + route
+            response.reason = HTTP_REASONS.get(status, "")
+            kind = "Client" if status < 500 else "Server"
+            raise requests.HTTPError(f"{status} {kind} Error: {response.reason} for url: {response.url}",
+                                     response=response)
+
     def batch_check_auth(self, api_paths: list, method: str = 'post') -> Dict[str, Dict[str, Any]]:
         """
         批量检查多个API的授权状态
@@ -139,11 +185,16 @@ class AuthClient:
 
         Returns:
             bool: 是否授权
+
+        Raises:
+            RateLimitExceeded: 被限流器拒绝（不是授权失败，调用方可退避重试）
         """
         try:
             result = self.check_auth(api_path, method)
             return result.get('authorized', False)
-        except Exception:
+        except Exception as e:
+            if getattr(e, "rate_limited", False):
+                raise
             return False
 
     def health_check(self) -> bool:
@@ -154,9 +205,8 @@ class AuthClient:
             bool: 服务是否可用
         """
         try:
-            url = f"{self.base_url}/api/auth/list"
-            response = self.session.get(url, timeout=5)
-            return response.status_code == 401  # 需要登录表示服务正常
+            status, _ = self.transport.request("GET", LIST_ROUTE, timeout=5)
+            return status == 401  # 需要登录表示服务正常
         except Exception:
             return False
 
@@ -169,6 +219,8 @@ class AuthClient:
         """
         return {
             "base_url": self.base_url,
+            "transport": type(self.transport).__name__,
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter is not None else None,
             "health": self.health_check(),
             "timeout": self.timeout
         }
@@ -190,10 +242,12 @@ def require_auth(auth_client: AuthClient, api_path: str = None, method: str = 'p
             # 如果未指定api_path，使用函数名
             check_path = api_path or f"/api/{func.__name__}"
 
-            if not auth_client.is_authorized(check_path, method):
-                raise PermissionError(f"API未授权: {check_path}")
+            # span 覆盖授权检查与函数体，可区分两者各自的耗时
+            with tracing.span(f"require_auth {check_path}", "auth", func=func.__qualname__):
+                if not auth_client.is_authorized(check_path, method):
+                    raise PermissionError(f"API未授权: {check_path}")
 
-            return func(*args, **kwargs)
+                return func(*args, **kwargs)
 
         return wrapper
 
@@ -209,15 +263,23 @@ class AuthContext:
         self.api_path = api_path
         self.method = method
         self.is_authorized = False
+        self._span = None
 
     def __enter__(self):
+        # span 覆盖整个 with 块，授权检查作为其子 span
+        self._span = tracing.span(f"AuthContext {self.api_path}", "auth")
+        self._span.__enter__()
         self.is_authorized = self.auth_client.is_authorized(self.api_path, self.method)
         if not self.is_authorized:
+            self._span.__exit__(PermissionError, None, None)
+            self._span = None
             raise PermissionError(f"API未授权: {self.api_path}")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        pass
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc_val, exc_tb)
+            self._span = None
 
 
 # 使用示例和测试代码
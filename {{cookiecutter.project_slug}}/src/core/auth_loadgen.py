@@ -0,0 +1,229 @@
+"""
+File: auth_loadgen.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: AuthClient 压测工具 | 多线程/多进程驱动 AuthClient，输出吞吐与延迟分位数
+
+Usage:
+    # 对已运行的服务压测
+    python -m core.auth_loadgen --url http://localhost:8000 --threads 16 --processes 2 --duration 10
+    # 自带本地替身服务（模拟 5ms 延迟、1% 错误率）
+    python -m core.auth_loadgen --stub --stub-latency-ms 5 --stub-error-rate 0.01 --threads 32
+    # 替身服务监听 Unix 域套接字，比较 TCP 与 UDS
+    python -m core.auth_loadgen --stub --stub-unix-socket /tmp/lanauthgate.sock --threads 8
+    # 4 个进程共享 500 req/s 的出站配额
+    python -m core.auth_loadgen --stub --processes 4 --threads 8 --duration 5 --rate 500 --rate-shared /tmp/auth.rl
+"""
+
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .auth_client import AuthClient
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """已排序序列的分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(q / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _make_client(base_url: str, pool_size: int, rate_limiter=None) -> AuthClient:
+    client = AuthClient(base_url, rate_limiter=rate_limiter)
+    if pool_size and client.session is not None:  # 仅 TCP 传输使用 requests 连接池
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        client.session.mount("http://", adapter)
+        client.session.mount("https://", adapter)
+    return client
+
+
+def _run_process(
+    base_url: str,
+    paths: List[str],
+    threads: int,
+    requests_per_thread: int,
+    duration: float,
+    method: str,
+    shared_client: bool,
+    pool_size: int,
+    rate_limit: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """单个进程内启动多个线程发压，返回原始延迟列表与错误数"""
+    # 每请求的 INFO/ERROR 日志会成为压测瓶颈，错误已计入统计
+    logging.getLogger("AuthClient").setLevel(logging.CRITICAL)
+    limiter = None
+    if rate_limit:
+        from decorators.rate_limit import RateLimiter
+        limiter = RateLimiter(name="auth_loadgen", **rate_limit)  # 进程内所有线程共用；shared_path 跨进程共用
+    shared = _make_client(base_url, pool_size or threads, limiter) if shared_client else None
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker(index: int) -> None:
+        client = shared or _make_client(base_url, pool_size, limiter)
+        local, failed, done = [], 0, 0
+        while (time.perf_counter() < deadline) if deadline is not None else (done < requests_per_thread):
+            path = paths[(index + done) % len(paths)]
+            done += 1
+            start = time.perf_counter()
+            try:
+                client.check_auth(path, method)
+                local.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return {"latencies": latencies, "errors": errors[0], "elapsed": time.perf_counter() - start,
+            "rate_limit": limiter.stats() if limiter is not None else None}
+
+
+def run_load(
+    base_url: str,
+    paths: Optional[List[str]] = None,
+    threads: int = 8,
+    processes: int = 1,
+    requests_per_thread: int = 500,
+    duration: float = 0.0,
+    method: str = "post",
+    shared_client: bool = False,
+    pool_size: int = 0,
+    rate_limit: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    驱动 AuthClient 发压并汇总统计
+
+    Args:
+        base_url: 授权服务地址
+        paths: 轮询检查的 API 路径列表
+        threads: 每个进程的线程数
+        processes: 进程数，1 表示只在当前进程发压
+        requests_per_thread: 每个线程请求数（duration 为 0 时生效）
+        duration: 持续时间（秒），大于 0 时按时间发压
+        method: 'post' 或 'get'
+        shared_client: 进程内所有线程共享一个 AuthClient（考察连接池大小的影响）
+        pool_size: requests 连接池大小，0 表示默认
+        rate_limit: RateLimiter 参数（rate / burst / max_concurrent / timeout / blocking / shared_path），None 表示不限流
+
+    Returns:
+        包含 requests / errors / throughput / 延迟分位数（毫秒）的字典
+    """
+    paths = paths or ["/api/fastdem/v1"]
+    job = (base_url, paths, threads, requests_per_thread, duration, method, shared_client, pool_size, rate_limit)
+
+    start = time.perf_counter()
+    if processes <= 1:
+        parts = [_run_process(*job)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_run_process, *zip(*[job] * processes)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(v for part in parts for v in part["latencies"])
+    errors = sum(part["errors"] for part in parts)
+    elapsed = max(part["elapsed"] for part in parts)
+    limited = [part["rate_limit"] for part in parts if part["rate_limit"]]
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "min": latencies[0] if latencies else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p99": _percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        },
+        "rate_limit": {
+            "rejected": sum(p["rejected"] for p in limited),
+            "waited": sum(p["waited"] for p in limited),
+            "wait_mean_ms": sum(p["wait_total_s"] for p in limited) * 1000 / max(sum(p["calls"] for p in limited), 1),
+            "wait_max_ms": max(p["wait_max_s"] for p in limited) * 1000,
+        } if limited else None,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lat = report["latency_ms"]
+    text = (
+        f"requests={report['requests']} errors={report['errors']} "
+        f"elapsed={report['elapsed_s']:.2f}s throughput={report['throughput_rps']:.1f} req/s\n"
+        f"latency ms: min={lat['min']:.2f} p50={lat['p50']:.2f} p90={lat['p90']:.2f} "
+        f"p99={lat['p99']:.2f} max={lat['max']:.2f} mean={lat['mean']:.2f}"
+    )
+    limit = report.get("rate_limit")
+    if limit:
+        text += (f"\nrate limit: rejected={limit['rejected']} waited={limit['waited']} "
+                 f"wait mean={limit['wait_mean_ms']:.2f}ms max={limit['wait_max_ms']:.2f}ms")
+    return text
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="AuthClient 压测工具")
+    parser.add_argument("--url", default="http://localhost:8000", help="授权服务地址，http://host:port 或 unix:///path")
+    parser.add_argument("--path", action="append", dest="paths", metavar="PATH", help="检查的 API 路径，可重复")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=500, help="每线程请求数")
+    parser.add_argument("--duration", type=float, default=0.0, help="按时间发压（秒）")
+    parser.add_argument("--method", choices=["post", "get"], default="post")
+    parser.add_argument("--shared-client", action="store_true", help="线程间共享一个 AuthClient")
+    parser.add_argument("--pool-size", type=int, default=0, help="requests 连接池大小")
+    parser.add_argument("--rate", type=float, default=None, help="出站限流：每秒请求数（令牌桶）")
+    parser.add_argument("--burst", type=float, default=None, help="令牌桶容量")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="出站并发上限")
+    parser.add_argument("--rate-timeout", type=float, default=None, help="等待令牌/并发槽的超时（秒）")
+    parser.add_argument("--rate-reject", action="store_true", help="拿不到令牌立即拒绝而不是等待")
+    parser.add_argument("--rate-shared", default=None, metavar="PATH", help="多进程共享限流状态的文件")
+    parser.add_argument("--stub", action="store_true", help="启动本地替身服务并对其压测")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-unix-socket", default=None, metavar="PATH", help="替身服务监听 Unix 域套接字")
+    args = parser.parse_args(argv)
+
+    stub = None
+    base_url = args.url
+    if args.stub:
+        from .auth_stub import AuthStubServer
+        stub = AuthStubServer(latency_ms=args.stub_latency_ms, jitter_ms=args.stub_jitter_ms,
+                              error_rate=args.stub_error_rate, unix_socket=args.stub_unix_socket).start()
+        base_url = stub.base_url
+
+    rate_limit = None
+    if args.rate or args.max_concurrent:
+        rate_limit = {"rate": args.rate, "burst": args.burst, "max_concurrent": args.max_concurrent,
+                      "timeout": args.rate_timeout, "blocking": not args.rate_reject, "shared_path": args.rate_shared}
+
+    try:
+        report = run_load(base_url, args.paths, args.threads, args.processes, args.requests,
+                          args.duration, args.method, args.shared_client, args.pool_size, rate_limit)
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    print(f"target={base_url} threads={args.threads} processes={args.processes}")
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+File: auth_stub.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: 本地 LanAuthGate 替身服务 | 实现 /api/auth/check、/api/auth/check/get、/api/auth/list，用于压测与测试 AuthClient
+
+Usage:
+    python -m core.auth_stub --port 8000 --latency-ms 5 --jitter-ms 2 --error-rate 0.01 \\
+        --allow /api/fastdem/v1 --deny /api/fastfault/v1 --default deny
+    # 监听 Unix 域套接字（AuthClient("unix:///tmp/lanauthgate.sock")）
+    python -m core.auth_stub --unix-socket /tmp/lanauthgate.sock
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import threading
+import socketserver
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """请求处理器，配置从 server.stub 读取"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive，客户端可复用连接
+    disable_nagle_algorithm = True  # 头与正文分两次写出，避免 Nagle + 延迟 ACK 的 40ms 停顿
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, api_path: Optional[str]) -> None:
+        stub: AuthStubServer = self.server.stub
+        route = urlsplit(self.path).path
+        stub.record(route)
+        stub.simulate_latency()
+
+        if stub.should_fail():
+            self._send_json(500, {"error": "injected failure", "status": "error"})
+            return
+        if route == "/api/auth/list" or stub.login_required:
+            # 真实服务需要登录，AuthClient.health_check 以 401 判断服务正常；login_required 时所有路由均为 401
+            self._send_json(401, {"error": "login required"})
+            return
+        if api_path is None:
+            self._send_json(404 if route not in ("/api/auth/check", "/api/auth/check/get") else 400,
+                            {"error": "invalid request", "status": "error"})
+            return
+
+        authorized = stub.decide(api_path)
+        self._send_json(200, {"api_path": api_path, "authorized": authorized,
+                              "status": "authorized" if authorized else "unauthorized"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        api_path = None
+        if urlsplit(self.path).path == "/api/auth/check":
+            try:
+                api_path = json.loads(raw or b"{}").get("api_path")
+            except ValueError:
+                api_path = None
+        self._handle(api_path)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        api_path = None
+        if parts.path == "/api/auth/check/get":
+            api_path = parse_qs(parts.query).get("path", [None])[0]
+        self._handle(api_path)
+
+    def log_message(self, format, *args):
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixStubHandler(_StubHandler):
+    """Unix 域套接字上的请求处理器"""
+
+    disable_nagle_algorithm = False  # TCP_NODELAY 不适用于 AF_UNIX
+
+    def address_string(self) -> str:
+        return "unix"
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class AuthStubServer:
+    """LanAuthGate 本地替身服务（多线程 HTTP）"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        decisions: Optional[Dict[str, bool]] = None,
+        default_authorized: bool = True,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+        unix_socket: Optional[str] = None,
+        login_required: bool = False,
+    ):
+        """
+        初始化替身服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示随机可用端口
+            decisions: 按路径指定的授权结果，未列出的路径使用 default_authorized
+            default_authorized: 默认授权结果
+            latency_ms: 每个请求固定附加延迟（毫秒）
+            jitter_ms: 在固定延迟上叠加 [0, jitter_ms) 的随机延迟
+            error_rate: 返回 500 的概率，0~1
+            seed: 随机种子，便于复现
+            verbose: 是否打印访问日志
+            unix_socket: 给定时监听该 Unix 域套接字路径，忽略 host/port
+            login_required: 模拟未登录：授权检查接口也返回 401
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate 必须在 0~1 之间")
+        self.decisions = dict(decisions or {})
+        self.default_authorized = default_authorized
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.unix_socket = unix_socket
+        self.login_required = login_required
+
+        if unix_socket:
+            if os.path.exists(unix_socket):
+                os.unlink(unix_socket)  # 上次运行残留的套接字文件
+            self.httpd = _UnixHTTPServer(unix_socket, _UnixStubHandler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+            self.httpd.daemon_threads = True
+        self.httpd.stub = self
+
+    @property
+    def base_url(self) -> str:
+        if self.unix_socket:
+            return f"unix://{self.unix_socket}"
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def decide(self, api_path: str) -> bool:
+        if not api_path.startswith('/'):
+            api_path = '/' + api_path
+        return self.decisions.get(api_path, self.default_authorized)
+
+    def record(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] += 1
+
+    def simulate_latency(self) -> None:
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._lock:
+                delay += self._random.random() * self.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def start(self) -> "AuthStubServer":
+        """后台线程启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="AuthStubServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """前台运行，直到 Ctrl+C"""
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """关闭监听套接字，并删除 Unix 域套接字文件"""
+        self.httpd.server_close()
+        if self.unix_socket and os.path.exists(self.unix_socket):
+            os.unlink(self.unix_socket)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="LanAuthGate 本地替身服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", default=None, metavar="PATH", help="监听 Unix 域套接字而不是 TCP")
+    parser.add_argument("--allow", action="append", default=[], metavar="PATH", help="授权的 API 路径，可重复")
+    parser.add_argument("--deny", action="append", default=[], metavar="PATH", help="拒绝的 API 路径，可重复")
+    parser.add_argument("--default", choices=["allow", "deny"], default="allow", help="未列出路径的默认结果")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--login-required", action="store_true", help="授权检查接口也返回 401（模拟未登录）")
+    args = parser.parse_args(argv)
+
+    decisions = {path: True for path in args.allow}
+    decisions.update({path: False for path in args.deny})
+    stub = AuthStubServer(args.host, args.port, decisions, args.default == "allow",
+                          args.latency_ms, args.jitter_ms, args.error_rate, args.seed, args.verbose, args.unix_socket,
+                          args.login_required)
+    print(f"LanAuthGate stub listening on {stub.base_url} (Ctrl+C to stop)")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.close()
+        print("Requests served:", dict(stub.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+File: auth_transport.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: AuthClient 可插拔传输层 | TCP (requests) / Unix 域套接字 HTTP / 进程内决策函数
+
+传输层只负责把一次请求送达 LanAuthGate 并取回 (状态码, JSON 数据)，授权语义仍由 AuthClient 处理：
+
+    AuthClient("http://localhost:8000")                    # TCP，默认
+    AuthClient("unix:///run/lanauthgate.sock")             # Unix 域套接字，同机部署时省去 TCP 协议栈
+    AuthClient("http+unix://%2Frun%2Flanauthgate.sock")    # 同上，requests-unixsocket 风格的地址
+    AuthClient(transport=InProcessTransport(decide))       # 不经过套接字，直接调用本地决策函数
+
+自定义传输只需实现 request(method, route, params=None, payload=None, timeout=None) -> (status, data)。
+"""
+
+import json
+import socket
+import threading
+import http.client
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlencode
+
+import requests
+
+Response = Tuple[int, Optional[Dict[str, Any]]]
+
+CHECK_ROUTE = "/api/auth/check"
+CHECK_GET_ROUTE = "/api/auth/check/get"
+LIST_ROUTE = "/api/auth/list"
+
+
+def _decode(status: int, body: bytes) -> Optional[Dict[str, Any]]:
+    """
+    成功响应解析为 JSON 对象，错误响应的正文不参与授权判断
+
+    与 response.json() 一致：正文为空、不是合法 JSON 或不是对象时抛出 requests.JSONDecodeError
+    （RequestException 的子类），由 AuthClient 按请求失败记录日志与指标
+    """
+    if status >= 400:
+        return None
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+    except UnicodeDecodeError as e:
+        raise requests.JSONDecodeError(str(e), "", 0) from e
+    if not isinstance(data, dict):
+        raise requests.JSONDecodeError("Expecting a JSON object", body.decode("utf-8", "replace"), 0)
+    return data
+
+
+class HTTPTransport:
+    """TCP 传输：requests.Session，连接池与 keep-alive 由 requests 管理"""
+
+    def __init__(self, base_url: str = "http://localhost:8000"):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method: str, route: str, params: Optional[Dict[str, str]] = None,
+                payload: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Response:
+        response = self.session.request(method, self.base_url + route, params=params, json=payload, timeout=timeout)
+        return response.status_code, _decode(response.status_code, response.content)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """通过 AF_UNIX 套接字发送 HTTP/1.1 请求"""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class UnixSocketTransport:
+    """
+    Unix 域套接字 HTTP 传输
+
+    每个线程持有一条 keep-alive 连接（http.client 连接不是线程安全的）；
+    网络层错误转换为 requests 的异常类型，AuthClient 的错误处理保持不变。
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.base_url = f"unix://{socket_path}"
+        self._local = threading.local()
+
+    def _connection(self, timeout: Optional[float]) -> _UnixHTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _UnixHTTPConnection(self.socket_path, timeout)
+        elif conn.sock is not None and conn.timeout != timeout:
+            conn.sock.settimeout(timeout)
+        conn.timeout = timeout
+        return conn
+
+    def _send(self, conn: _UnixHTTPConnection, method: str, target: str,
+              body: Optional[bytes], headers: Dict[str, str]) -> Tuple[int, bytes]:
+        conn.request(method, target, body=body, headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def request(self, method: str, route: str, params: Optional[Dict[str, str]] = None,
+                payload: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Response:
+        target = f"{route}?{urlencode(params)}" if params else route
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn = self._connection(timeout)
+        try:
+            try:
+                status, data = self._send(conn, method.upper(), target, body, headers)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # 服务端关闭了空闲的 keep-alive 连接：重连后重试一次
+                conn.close()
+                status, data = self._send(conn, method.upper(), target, body, headers)
+        except socket.timeout as e:
+            conn.close()
+            raise requests.Timeout(f"{self.base_url}{route}: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise requests.ConnectionError(f"{self.base_url}{route}: {e}") from e
+        return status, _decode(status, data)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class InProcessTransport:
+    """
+    进程内传输：不经过任何套接字，直接调用本地决策函数
+
+    decide(api_path) 返回 bool，或返回与 LanAuthGate 相同结构的 dict（至少包含 'authorized'）。
+    适用于测试与嵌入式部署；路由与状态码与真实服务保持一致（/api/auth/list 返回 401）。
+    """
+
+    base_url = "inproc://"
+
+    def __init__(self, decide: Callable[[str], Union[bool, Dict[str, Any]]]):
+        self.decide = decide
+
+    def request(self, method: str, route: str, params: Optional[Dict[str, str]] = None,
+                payload: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Response:
+        if route == LIST_ROUTE:
+            return 401, None
+        if route == CHECK_ROUTE and method.upper() == "POST":
+            api_path = (payload or {}).get("api_path")
+        elif route == CHECK_GET_ROUTE and method.upper() == "GET":
+            api_path = (params or {}).get("path")
+        else:
+            return 404, None
+        if not api_path:
+            return 400, None
+
+        decision = self.decide(api_path)
+        if isinstance(decision, dict):
+            return 200, decision
+        authorized = bool(decision)
+        return 200, {"api_path": api_path, "authorized": authorized,
+                     "status": "authorized" if authorized else "unauthorized"}
+
+    def close(self) -> None:
+        pass
+
+
+def make_transport(base_url: str):
+    """
+    按地址选择传输
+
+    Args:
+        base_url: http(s)://host:port、unix:///path/to.sock 或 http+unix://<URL 编码的套接字路径>
+    """
+    if base_url.startswith("unix://"):
+        return UnixSocketTransport(base_url[len("unix://"):])
+    if base_url.startswith("http+unix://"):
+        return UnixSocketTransport(unquote(base_url[len("http+unix://"):].split("/", 1)[0]))
+    return HTTPTransport(base_url)
@@ -11,3 +11,29 @@ core/core.pyx   ： 生产期调用
 # 优先级 .pyd > .so > .py > .pyx
 from core.core import *
 """
+
+from .auth_client import AuthClient
+
+# 与 core.pyx 保持一致的纯 Python 实现：模块级复用同一个客户端
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = AuthClient()  # 使用默认地址 http://localhost:8000
+    return _client
+
+
+# 最简单的使用方式
+def quick_check(api_path):
+    """
+    快速检查API授权
+
+    Args:
+        api_path: 要检查的API路径
+
+    Returns:
+        bool: 是否授权
+    """
+    return _get_client().is_authorized(api_path)
@@ -1,3 +1,4 @@
+# cython: binding=False
 """
 File: core.pyx
 Author: FastXTeam/wanqiang.liu
@@ -10,9 +11,19 @@ core/__init__.py: 中导出需要暴露给外层的接口
 
 from .auth_client import AuthClient
 
+# 模块级复用同一个客户端（及其 requests.Session 连接池），避免循环调用时反复建连
+cdef object _client = None
+
+
+cdef object _get_client():
+    global _client
+    if _client is None:
+        _client = AuthClient()  # 使用默认地址 http://localhost:8000
+    return _client
+
 
 # 最简单的使用方式
-def quick_check(api_path):
+def quick_check(api_path):  # 公开接口保持 object 签名，与 core.py 行为一致
     """
     快速检查API授权
 
@@ -22,8 +33,7 @@ def quick_check(api_path):
     Returns:
         bool: 是否授权
     """
-    client = AuthClient()  # 使用默认地址 http://localhost:8000
-    return client.is_authorized(api_path)
+    return _get_client().is_authorized(api_path)
 
 
 if __name__ == "__main__":
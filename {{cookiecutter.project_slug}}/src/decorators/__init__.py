@@ -1,4 +1,35 @@
-from .logging import log_calls
-from .timing import timeit
+import sys
+import types
+from importlib import import_module
+from typing import Any
 
-__all__ = ["log_calls", "timeit"]
+from .logging import log_func_call
+from .timing import timer
+
+__all__ = ["log_func_call", "timer", "rate_limit", "RateLimiter", "RateLimitExceeded"]
+
+# 限流器在首次访问时才加载：只用 @timer / @log_func_call 的模块不为 rate_limit 及其指标付出导入开销
+_LAZY_ATTRS = ("rate_limit", "RateLimiter", "RateLimitExceeded")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        value = getattr(import_module(".rate_limit", __name__), name)
+        globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Package(types.ModuleType):
+    """
+    导入子模块 decorators.rate_limit 时，导入系统会把同名的包属性设为子模块本身；
+    这里改为设为其中的 rate_limit 装饰器，与立即导入时 `from decorators import rate_limit` 的结果一致
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "rate_limit" and isinstance(value, types.ModuleType):
+            value = value.rate_limit
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -7,6 +7,11 @@ Description: Decorator to log function calls, arguments, results and exceptions.
 """
 from functools import wraps
 from config import logger
+from utils.metrics import REGISTRY
+from utils.tracing import call_span
+
+_CALLS = REGISTRY.counter("function_calls_total", "Calls of @log_func_call functions", ["func"])
+_EXCEPTIONS = REGISTRY.counter("function_exceptions_total", "Exceptions raised by @log_func_call functions", ["func"])
 
 def log_func_call(log_args: bool = True, log_result: bool = True, log_exceptions: bool = True):
     """
@@ -19,16 +24,23 @@ def log_func_call(log_args: bool = True, log_result: bool = True, log_exceptions
         log_exceptions (bool): Whether to log exceptions 是否记录异常
     """
     def decorator(func):
+        name = func.__qualname__
+        calls = _CALLS.labels(name)
+        exceptions = _EXCEPTIONS.labels(name)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            calls.inc()
             try:
                 if log_args:
                     logger.info(f"[CALL] {func.__name__} called with args={args}, kwargs={kwargs}")
-                result = func(*args, **kwargs)
+                with call_span(wrapper, func, name, "call"):  # 与 @timer 叠加时共用一个 span
+                    result = func(*args, **kwargs)
                 if log_result:
                     logger.info(f"[RETURN] {func.__name__} returned {result}")
                 return result
             except Exception as e:
+                exceptions.inc()
                 if log_exceptions:
                     logger.exception(f"[EXCEPTION] {func.__name__} raised an exception: {e}")
                 raise  # 保留原异常，不吞掉
@@ -0,0 +1,439 @@
+"""
+File: rate_limit.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Token-bucket and concurrency-limit rate limiting for sync and async calls.
+
+    @rate_limit(rate=50, burst=10, max_concurrent=8, timeout=2.0)
+    def call_service(...): ...
+
+    limiter = RateLimiter(rate=200, shared_path="/tmp/lanauthgate.rl")   # 同机多进程共享配额
+    client = AuthClient(url, rate_limiter=limiter)
+
+blocking=True 时等待令牌/并发槽（超过 timeout 抛出 RateLimitExceeded），blocking=False 时立即拒绝。
+令牌桶按预约计算等待时间（令牌可为负，表示已被预约），每个调用最多睡眠一次，先到先得。
+shared_path 给定时，令牌桶状态存放在该文件中（flock 互斥，pread/pwrite 读写，时间戳为 time.time()，
+跨重启/容器仍有意义），并发槽为同一文件上的字节范围锁：进程异常退出时由内核自动释放，不会泄漏配额。
+同一进程内指向同一路径的多个 RateLimiter 共用一个文件描述与槽位表（POSIX 记录锁按进程归属）。
+"""
+import os
+import time
+import struct
+import threading
+from collections import deque
+from functools import wraps
+from typing import Optional
+
+from utils.metrics import REGISTRY
+
+_WAIT = REGISTRY.histogram("ratelimit_wait_seconds", "Time spent waiting for a rate limiter", ["limiter"],
+                           buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+_REJECTED = REGISTRY.counter("ratelimit_rejected_total", "Calls rejected by a rate limiter", ["limiter"])
+
+_STATE = struct.Struct("<dd")  # (tokens, last_refill_time)
+_SLOT_OFFSET = 4096            # 并发槽字节锁的起始偏移，与令牌桶状态互不重叠
+_POLL_MIN, _POLL_MAX = 0.0002, 0.005
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when no token/slot is available (non-blocking) or the wait would exceed timeout."""
+
+
+class _FairSemaphore:
+    """先到先得的信号量：释放时直接交给最早的等待者，避免释放方立即抢回造成的饥饿"""
+
+    def __init__(self, value: int):
+        self._lock = threading.Lock()
+        self._value = value
+        self._waiters: deque = deque()
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return True
+            if not blocking:
+                return False
+            waiter = threading.Lock()
+            waiter.acquire()
+            self._waiters.append(waiter)
+        if waiter.acquire(timeout=-1 if timeout is None else timeout):
+            return True
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return False
+            except ValueError:
+                return True  # 超时的同时已被 release 交接
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().release()
+            else:
+                self._value += 1
+
+
+class _LocalBucket:
+    """进程内令牌桶状态"""
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, capacity: float):
+        self._lock = threading.Lock()
+        self._state = (capacity, self.clock())
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._lock.release()
+
+    def read(self) -> tuple:
+        return self._state
+
+    def write(self, tokens: float, last: float) -> None:
+        self._state = (tokens, last)
+
+
+class _SharedFile:
+    """多进程共享的令牌桶状态与并发槽（同一个本地文件），通过 _shared_file() 按路径复用"""
+
+    clock = staticmethod(time.time)  # 单调时钟只在一次启动内有效，持久化的状态使用墙钟
+
+    def __init__(self, path: str, capacity: float):
+        import fcntl  # 仅 POSIX；Windows 上 shared_path 不可用
+        self._fcntl = fcntl
+        self._lock = threading.Lock()  # flock 属于打开的文件描述，进程内线程之间仍需互斥
+        self._held_slots: set = set()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self:
+            if os.fstat(self.fd).st_size < _STATE.size:
+                os.pwrite(self.fd, _STATE.pack(capacity, self.clock()), 0)
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._fcntl.flock(self.fd, self._fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._fcntl.flock(self.fd, self._fcntl.LOCK_UN)
+        self._lock.release()
+
+    def read(self) -> tuple:
+        return _STATE.unpack(os.pread(self.fd, _STATE.size, 0))
+
+    def write(self, tokens: float, last: float) -> None:
+        os.pwrite(self.fd, _STATE.pack(tokens, last), 0)
+
+    def try_acquire_slot(self, limit: int) -> Optional[int]:
+        """
+        非阻塞地锁住 [0, limit) 中的一个空闲槽，返回槽号，没有空闲槽时返回 None；
+        POSIX 记录锁按进程归属，进程内已持有的槽（含其他 RateLimiter 持有的）需跳过
+        """
+        with self._lock:
+            for slot in range(limit):
+                if slot in self._held_slots:
+                    continue
+                try:
+                    self._fcntl.lockf(self.fd, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB, 1, _SLOT_OFFSET + slot)
+                except OSError:
+                    continue
+                self._held_slots.add(slot)
+                return slot
+        return None
+
+    def release_slot(self, slot: int) -> None:
+        """释放 try_acquire_slot 返回的槽"""
+        with self._lock:
+            self._held_slots.remove(slot)
+            self._fcntl.lockf(self.fd, self._fcntl.LOCK_UN, 1, _SLOT_OFFSET + slot)
+
+
+_shared_files: dict = {}
+_shared_files_lock = threading.Lock()
+
+
+def _shared_file(path: str, capacity: float) -> _SharedFile:
+    """
+    每个进程每个路径一个 _SharedFile：同一进程的两个 fd 会互相“获得”同一记录锁，
+    且关闭其中任一 fd 会释放本进程在该文件上的全部记录锁。fork 出的子进程按 pid 重新打开。
+    """
+    key = (os.getpid(), os.path.realpath(path))
+    with _shared_files_lock:
+        shared = _shared_files.get(key)
+        if shared is None:
+            shared = _shared_files[key] = _SharedFile(path, capacity)
+        return shared
+
+
+class RateLimiter:
+    """
+    令牌桶 + 并发上限，线程安全，可用作装饰器与（异步）上下文管理器
+
+    Args:
+        rate: 每秒令牌数，None 表示不限速率
+        burst: 桶容量（允许的突发），默认 max(1, rate)
+        max_concurrent: 同时进行的调用数上限，None 表示不限
+        timeout: 阻塞模式下最长等待秒数，None 表示一直等待
+        blocking: False 时拿不到令牌/槽立即抛出 RateLimitExceeded
+        shared_path: 多进程共享状态的本地文件路径，None 表示仅进程内
+        name: 指标标签名
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        timeout: Optional[float] = None,
+        blocking: bool = True,
+        shared_path: Optional[str] = None,
+        name: str = "default",
+    ):
+        if rate is None and max_concurrent is None:
+            raise ValueError("rate 与 max_concurrent 至少指定一个")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent 必须大于等于 1")
+        self.rate = rate
+        self.burst = float(burst if burst is not None else max(1.0, rate or 1.0))
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.blocking = blocking
+        self.name = name
+        self._shared = _shared_file(shared_path, self.burst) if shared_path else None
+        self._bucket = self._shared if self._shared is not None else _LocalBucket(self.burst)
+        self._semaphore = _FairSemaphore(max_concurrent) if max_concurrent else None
+        # 本限流器持有的跨进程槽：同一路径上 max_concurrent 不同的限流器共用槽位表，只能释放自己拿到的槽；
+        # 本限流器的槽都在 [0, max_concurrent) 内可互换，释放方不必是获取方线程
+        self._slots: list = []
+        self._stats_lock = threading.Lock()
+        self._calls = self._rejected = self._waited = 0
+        self._wait_total = self._wait_max = 0.0
+        self._wait_metric = _WAIT.labels(name)
+        self._rejected_metric = _REJECTED.labels(name)
+
+    # --------------------
+    # 令牌桶
+    # --------------------
+    def _reserve(self, deadline: Optional[float]) -> float:
+        """预约一个令牌，返回需要等待的秒数；拿不到（非阻塞或超过 deadline）时抛出"""
+        if self.rate is None:
+            return 0.0
+        with self._bucket as bucket:
+            tokens, last = bucket.read()
+            now = bucket.clock()
+            # 时钟回拨或状态来自另一次启动时 last 可能在未来：不补充也不倒扣
+            tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if wait and (not self.blocking or (deadline is not None and wait > deadline - time.monotonic())):
+                bucket.write(tokens, now)
+                raise RateLimitExceeded(f"{self.name}: no token available (wait {wait:.3f}s)")
+            bucket.write(tokens - 1, now)  # 可为负：后来者在此基础上排队
+        return wait
+
+    def _refund(self) -> None:
+        """拿到令牌但未拿到并发槽时归还令牌"""
+        if self.rate is None:
+            return
+        with self._bucket as bucket:
+            tokens, last = bucket.read()
+            bucket.write(min(self.burst, tokens + 1), last)
+
+    # --------------------
+    # 并发槽
+    # --------------------
+    def _try_shared_slot(self) -> bool:
+        if self._shared is None:
+            return True
+        slot = self._shared.try_acquire_slot(self.max_concurrent)
+        if slot is None:
+            return False
+        self._slots.append(slot)  # list.append / pop 为原子操作
+        return True
+
+    def _try_slot(self) -> bool:
+        """非阻塞获取：先进程内信号量，再跨进程槽"""
+        if not self._semaphore.acquire(blocking=False):
+            return False
+        if self._try_shared_slot():
+            return True
+        self._semaphore.release()
+        return False
+
+    def _release_slot(self) -> None:
+        if self._shared is not None:
+            self._shared.release_slot(self._slots.pop())
+        self._semaphore.release()
+
+    def _slot_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        if not self.blocking:
+            return 0.0
+        return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+    def _acquire_slot(self, deadline: Optional[float]) -> None:
+        if self.max_concurrent is None:
+            return
+        timeout = self._slot_timeout(deadline)
+        # 进程内线程先在信号量上排队，同一进程最多 max_concurrent 个线程去竞争跨进程槽
+        acquired = self._semaphore.acquire(blocking=False) if timeout == 0.0 else self._semaphore.acquire(timeout=timeout)
+        if acquired:
+            if self._try_shared_slot():
+                return
+            if timeout != 0.0:
+                delay = _POLL_MIN  # 跨进程槽没有可等待的原语，退避轮询
+                while deadline is None or time.monotonic() < deadline:
+                    time.sleep(delay)
+                    if self._try_shared_slot():
+                        return
+                    delay = min(delay * 2, _POLL_MAX)
+            self._semaphore.release()
+        raise RateLimitExceeded(f"{self.name}: {self.max_concurrent} concurrent calls in flight")
+
+    async def _acquire_slot_async(self, deadline: Optional[float]) -> None:
+        import asyncio
+        if self.max_concurrent is None or self._try_slot():
+            return
+        if self._slot_timeout(deadline) != 0.0:
+            delay = _POLL_MIN  # 不阻塞事件循环：退避轮询
+            while deadline is None or time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                if self._try_slot():
+                    return
+                delay = min(delay * 2, _POLL_MAX)
+        raise RateLimitExceeded(f"{self.name}: {self.max_concurrent} concurrent calls in flight")
+
+    # --------------------
+    # 获取/释放
+    # --------------------
+    def _deadline(self) -> Optional[float]:
+        return None if self.timeout is None else time.monotonic() + self.timeout
+
+    def _record(self, start: float, rejected: bool = False) -> None:
+        waited = time.monotonic() - start
+        with self._stats_lock:
+            self._calls += 1
+            if rejected:
+                self._rejected += 1
+            elif waited > 0.0001:
+                self._waited += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        if rejected:
+            self._rejected_metric.inc()
+        else:
+            self._wait_metric.observe(waited)
+
+    def acquire(self) -> float:
+        """Block (or reject) until a token and a slot are available; returns seconds waited. 获取令牌与并发槽"""
+        start = time.monotonic()
+        deadline = self._deadline()
+        try:
+            wait = self._reserve(deadline)
+            if wait:
+                time.sleep(wait)
+            try:
+                self._acquire_slot(deadline)
+            except RateLimitExceeded:
+                self._refund()
+                raise
+        except RateLimitExceeded:
+            self._record(start, rejected=True)
+            raise
+        self._record(start)
+        return time.monotonic() - start
+
+    async def acquire_async(self) -> float:
+        """acquire() for coroutines: waits with asyncio.sleep. 协程版本"""
+        import asyncio  # 只有协程调用方需要，不计入模块导入开销
+        start = time.monotonic()
+        deadline = self._deadline()
+        try:
+            wait = self._reserve(deadline)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                await self._acquire_slot_async(deadline)
+            except RateLimitExceeded:
+                self._refund()
+                raise
+        except RateLimitExceeded:
+            self._record(start, rejected=True)
+            raise
+        self._record(start)
+        return time.monotonic() - start
+
+    def release(self) -> None:
+        if self.max_concurrent is not None:
+            self._release_slot()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __call__(self, func):
+        """Use the limiter as a decorator for sync or async functions. 作为装饰器使用"""
+        from inspect import iscoroutinefunction
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with self:
+                    return await func(*args, **kwargs)
+            async_wrapper.limiter = self
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        wrapper.limiter = self
+        return wrapper
+
+    def stats(self) -> dict:
+        """Wait-time statistics since creation. 等待时间统计"""
+        with self._stats_lock:
+            admitted = self._calls - self._rejected
+            return {
+                "calls": self._calls,
+                "admitted": admitted,
+                "rejected": self._rejected,
+                "waited": self._waited,
+                "wait_total_s": self._wait_total,
+                "wait_mean_s": self._wait_total / self._calls if self._calls else 0.0,
+                "wait_max_s": self._wait_max,
+            }
+
+
+def rate_limit(
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+    max_concurrent: Optional[int] = None,
+    timeout: Optional[float] = None,
+    blocking: bool = True,
+    shared_path: Optional[str] = None,
+    name: Optional[str] = None,
+):
+    """
+    Decorator limiting call rate and concurrency of a sync or async function.
+    限制函数调用速率与并发数的装饰器，参数同 RateLimiter；被装饰函数的 .limiter 可查看统计
+    """
+    def decorator(func):
+        limiter = RateLimiter(rate, burst, max_concurrent, timeout, blocking, shared_path,
+                              name or func.__qualname__)
+        return limiter(func)
+    return decorator
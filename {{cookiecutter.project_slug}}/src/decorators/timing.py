@@ -8,6 +8,11 @@ Description: Decorator to measure execution time of a function.
 import time
 from functools import wraps
 from config import logger  # 使用全局logger
+from utils.metrics import REGISTRY
+from utils.tracing import call_span
+
+# 所有被 timer 装饰的函数共用一个直方图，按函数名区分
+_DURATION = REGISTRY.histogram("function_duration_seconds", "Execution time of @timer functions", ["func"])
 
 def timer(unit: str = 's', log: bool = True):
     """
@@ -25,11 +30,17 @@ def timer(unit: str = 's', log: bool = True):
         raise ValueError(f"Unsupported unit '{unit}', choose from {list(units_map.keys())}")
 
     def decorator(func):
+        name = func.__qualname__
+        duration = _DURATION.labels(name)  # 装饰时解析子指标，调用时只做一次累加
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start = time.perf_counter()
-            result = func(*args, **kwargs)
-            elapsed = (time.perf_counter() - start) * units_map[unit]
+            with call_span(wrapper, func, name, "timer"):  # 未开启 tracing 时为空操作；与 @log_func_call 叠加时共用一个 span
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                seconds = time.perf_counter() - start
+            duration.observe(seconds)
+            elapsed = seconds * units_map[unit]
             msg = f"[TIMER] Function '{func.__name__}' executed in {elapsed:.3f} {unit}"
             if log:
                 logger.info(msg)  # 使用统一logger
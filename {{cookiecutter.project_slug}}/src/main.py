@@ -4,18 +4,376 @@ Author: {{ cookiecutter.author_name }}
 Version: {{ cookiecutter.project_version }}
 Date: {{ cookiecutter.date }}
 Description: Main CLI entry
+
+子命令的实现模块（api / core / utils / decorators / config）只在该子命令执行时导入，
+短命令不为用不到的模块付出启动时间。`--profile-startup` 输出各模块导入耗时与首次输出耗时。
 """
 
+import os
+import sys
+import time
+
+PROFILE_FLAG = "--profile-startup"
+
+
+def _profile_startup(argv: list[str], top: int = 20) -> int:
+    """
+    Re-run this CLI under `python -X importtime`, report import time per module and time-to-first-output.
+    以 -X importtime 重新运行当前命令，统计各模块导入耗时与首次输出耗时
+    """
+    import subprocess
+    import threading
+
+    if getattr(sys, "frozen", False):
+        print("--profile-startup 需要 Python 解释器运行（PyInstaller 打包版本不支持 -X importtime）")
+        return 1
+
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+
+    stderr_lines: list[str] = []
+    reader = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    reader.start()
+
+    first_output = None
+    for line in proc.stdout:
+        if first_output is None:
+            first_output = time.perf_counter() - start
+        sys.stdout.write(line)
+    code = proc.wait()
+    total = time.perf_counter() - start
+    reader.join()
+
+    imports = []  # (self_us, cumulative_us, name)
+    for line in stderr_lines:
+        if not line.startswith("import time:"):
+            sys.stderr.write(line)  # 子进程自身的错误输出原样转发
+        elif "cumulative" not in line:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            imports.append((int(self_us), int(cumulative_us), name.strip()))
+
+    total_import_us = sum(i[0] for i in imports)
+    print("\n==================== startup profile ====================")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module (top {top} by cumulative)")
+    for self_us, cumulative_us, name in sorted(imports, key=lambda i: -i[1])[:top]:
+        print(f"{self_us / 1000:9.2f} {cumulative_us / 1000:9.2f}  {name}")
+    print(f"modules imported      : {len(imports)}")
+    print(f"total import time     : {total_import_us / 1000:.2f} ms")
+    if first_output is not None:
+        print(f"time to first output  : {first_output * 1000:.2f} ms")
+    print(f"total wall time       : {total * 1000:.2f} ms (exit code {code})")
+    return code
+
+
+if PROFILE_FLAG in sys.argv[1:] and __name__ == "__main__":
+    sys.exit(_profile_startup([a for a in sys.argv[1:] if a != PROFILE_FLAG]))
+
+
 import warnings
-from api.api import *
-from decorators.timing import *
-from decorators.logging import *
+from datetime import datetime
+from typing import Annotated, Optional
+
+import typer
+
 warnings.filterwarnings('ignore', category=UserWarning)
 
-@timer(unit='s')
-@log_func_call(log_args=True, log_result=True)
+app = typer.Typer(help="{{ cookiecutter.project_name }} CLI", no_args_is_help=False, add_completion=False)
+auth_app = typer.Typer(help="LanAuthGate 授权相关命令")
+app.add_typer(auth_app, name="auth")
+logs_app = typer.Typer(help="日志索引与查询")
+app.add_typer(logs_app, name="logs")
+
+
+def _setup_metrics(json_path: Optional[str], prom_path: Optional[str], port: Optional[int]) -> None:
+    """按需启用指标导出；未使用任何 --metrics-* 选项时不导入 utils.metrics"""
+    import atexit
+    from utils import metrics
+
+    if json_path:
+        metrics.dump_json_at_exit(json_path)
+    if prom_path:
+        atexit.register(metrics.write_prometheus, prom_path)
+    if port is not None:
+        server = metrics.start_http_server(port)
+        typer.echo(f"[METRICS] http://127.0.0.1:{server.server_port}/metrics", err=True)
+
+
+def _setup_tracing(path: str) -> None:
+    """开启 tracing，退出时向 stderr 输出 span 树并写出 Chrome trace-event JSON"""
+    import atexit
+    from utils import tracing
+
+    def _export() -> None:
+        typer.echo(tracing.format_tree(), err=True)
+        typer.echo(f"[TRACE] {tracing.write_chrome_trace(path)}", err=True)
+
+    tracing.enable()
+    atexit.register(_export)
+
+
+@app.callback(invoke_without_command=True)
+def cli(
+        ctx: typer.Context,
+        profile_startup: Annotated[bool, typer.Option(
+            "--profile-startup", help="Report import time per module and time-to-first-output / 输出启动耗时分析")] = False,
+        metrics_json: Annotated[Optional[str], typer.Option(
+            help="Dump metrics as JSON on exit / 退出时写出 JSON 指标")] = None,
+        metrics_prom: Annotated[Optional[str], typer.Option(
+            help="Write Prometheus text file on exit / 退出时写出 Prometheus 文本指标")] = None,
+        metrics_port: Annotated[Optional[int], typer.Option(
+            help="Serve /metrics on 127.0.0.1:PORT while running / 运行期间提供 /metrics 端点")] = None,
+        trace: Annotated[Optional[str], typer.Option(
+            help="Record spans, print the span tree and write Chrome trace JSON on exit / 记录 span 并导出")] = None
+):
+    """{{ cookiecutter.project_name }}"""
+    if profile_startup:
+        # 作为 `python main.py` 运行时已在导入 typer 之前处理；此处覆盖被其他入口调用 app() 的情况
+        raise typer.Exit(_profile_startup([a for a in sys.argv[1:] if a != PROFILE_FLAG]))
+    if metrics_json or metrics_prom or metrics_port is not None:
+        _setup_metrics(metrics_json, metrics_prom, metrics_port)
+    if trace:
+        _setup_tracing(trace)
+    # 不带子命令时保持原有行为：执行核心流程
+    if ctx.invoked_subcommand is None:
+        run()
+
+
+@app.command()
+def run():
+    """Run core workflow (authorization check). 执行核心流程"""
+    from decorators.timing import timer
+    from decorators.logging import log_func_call
+    from api.api import core_init
+
+    timer(unit='s')(log_func_call(log_args=True, log_result=True)(core_init))()
+
+
+@app.command()
+def batch(
+        source: Annotated[str, typer.Argument(help="Directory, .jsonl, path list file or '-' / 输入目录、JSONL、路径列表文件或 '-'")],
+        output: Annotated[str, typer.Option("--output", "-o", help="Output JSONL, '-' for stdout / 输出 JSONL")] = "-",
+        func: Annotated[str, typer.Option(help="Task function 'module:attr' / 处理函数")] = "api.api:process_item",
+        workers: Annotated[Optional[int], typer.Option(help="Worker processes, default CPU count / 进程数")] = None,
+        chunk_size: Annotated[int, typer.Option(help="Items per task / 每个任务的工作项数")] = 64,
+        ordered: Annotated[bool, typer.Option("--ordered/--unordered", help="Keep input order / 按输入顺序输出")] = True,
+        api_path: Annotated[Optional[str], typer.Option(help="API path checked once per worker / 每进程授权检查的路径")] = None,
+        no_auth: Annotated[bool, typer.Option("--no-auth", help="Skip authorization check / 跳过授权检查")] = False
+):
+    """Run api functions over many work items on a process pool. 多进程批处理"""
+    from api.runner import run_file, DEFAULT_AUTH
+
+    try:
+        stats = run_file(source, output, func=func, workers=workers, chunk_size=chunk_size, ordered=ordered,
+                         auth=None if no_auth else DEFAULT_AUTH, api_path=api_path, progress_every=5.0)
+    except PermissionError as e:
+        typer.echo(f"[BATCH] {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"[BATCH] {stats['items']} items, {stats['errors']} errors in {stats['elapsed_s']:.2f}s "
+               f"({stats['items_per_s']:.1f} items/s, {stats['workers']} workers)", err=True)
+
+
+# --------------------
+# 授权
+# --------------------
+@auth_app.command("check")
+def auth_check(
+        api_path: Annotated[str, typer.Argument(help="API path to check / 要检查的 API 路径")],
+        url: Annotated[str, typer.Option(
+            help="LanAuthGate base url, http://host:port or unix:///path / 授权服务地址")] = "http://localhost:8000",
+        method: Annotated[str, typer.Option(help="'post' or 'get'")] = "post"
+):
+    """Check whether an API path is authorized. 检查 API 授权状态"""
+    from core.auth_client import AuthClient
+
+    authorized = AuthClient(url).is_authorized(api_path, method)
+    typer.echo(f"{api_path} -> {'✅ 已授权' if authorized else '❌ 未授权'}")
+    raise typer.Exit(0 if authorized else 1)
+
+
+@auth_app.command("stub")
+def auth_stub(
+        port: Annotated[int, typer.Option(help="Listen port / 监听端口")] = 8000,
+        latency_ms: Annotated[float, typer.Option(help="Injected latency / 注入延迟（毫秒）")] = 0.0,
+        error_rate: Annotated[float, typer.Option(help="Injected 500 ratio / 注入错误率")] = 0.0,
+        unix_socket: Annotated[Optional[str], typer.Option(help="Listen on a Unix socket / 监听 Unix 域套接字")] = None
+):
+    """Run the local LanAuthGate stand-in server. 运行本地授权替身服务"""
+    from core.auth_stub import main as stub_main
+
+    argv = ["--port", str(port), "--latency-ms", str(latency_ms), "--error-rate", str(error_rate)]
+    if unix_socket:
+        argv += ["--unix-socket", unix_socket]
+    stub_main(argv)
+
+
+@auth_app.command("loadtest", context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def auth_loadtest(ctx: typer.Context):
+    """Drive AuthClient under load, options as `python -m core.auth_loadgen`. 授权客户端压测"""
+    from core.auth_loadgen import main as loadgen_main
+
+    loadgen_main(ctx.args)
+
+
+# --------------------
+# 加解密
+# --------------------
+@app.command()
+def encrypt(
+        input_path: Annotated[str, typer.Argument(help="Input file / 输入文件")],
+        output_path: Annotated[str, typer.Argument(help="Encrypted output file / 加密输出文件")]
+):
+    """Encrypt a file with AES-CBC. AES 加密文件"""
+    from utils.helpers import aes_encrypt_file
+
+    aes_encrypt_file(input_path, output_path)
+    typer.echo(output_path)
+
+
+@app.command()
+def decrypt(
+        input_path: Annotated[str, typer.Argument(help="Encrypted file / 加密文件")],
+        output_path: Annotated[str, typer.Argument(help="Decrypted output file / 解密输出文件")]
+):
+    """Decrypt an AES-CBC encrypted file. AES 解密文件"""
+    from utils.helpers import aes_decrypt_file
+
+    aes_decrypt_file(input_path, output_path)
+    typer.echo(output_path)
+
+
+# --------------------
+# 压缩/解压缩
+# --------------------
+@app.command()
+def archive(
+        folder: Annotated[str, typer.Argument(help="Folder to compress / 待压缩文件夹")],
+        name: Annotated[Optional[str], typer.Option(help="Zip file name / 压缩文件名")] = None,
+        password: Annotated[Optional[str], typer.Option(help="Optional password / 可选密码")] = None,
+        encrypt: Annotated[bool, typer.Option(
+            "--encrypt", help="Stream into AES-encrypted <name>.zip.enc, no temp zip / 流式压缩并 AES 加密")] = False
+):
+    """Compress a folder into <name>.zip next to it. 压缩文件夹"""
+    from utils.helpers import make_archive, encrypt_archive
+
+    if encrypt:
+        if password is not None:
+            raise typer.BadParameter("--password cannot be combined with --encrypt (the archive is AES-encrypted "
+                                     "with the configured key) / --encrypt 使用配置的 AES 密钥，不支持 --password")
+        folder = os.path.abspath(folder)
+        output = os.path.join(os.path.dirname(folder), f"{name or os.path.basename(folder)}.zip.enc")
+        typer.echo(encrypt_archive(folder, output))
+        return
+    typer.echo(make_archive(folder, name, password=password))
+
+
+@app.command()
+def extract(
+        zip_path: Annotated[str, typer.Argument(help="Zip file path / 压缩包路径")],
+        extract_dir: Annotated[str, typer.Argument(help="Directory to extract / 解压目录")],
+        password: Annotated[Optional[str], typer.Option(help="Optional password / 可选密码")] = None,
+        encrypted: Annotated[bool, typer.Option(
+            "--encrypted", help="Input is an AES-encrypted archive from `archive --encrypt` / 输入为加密压缩包")] = False
+):
+    """Extract a zip file. 解压"""
+    from utils.helpers import unzip_file, decrypt_extract
+
+    if encrypted:
+        if password is not None:
+            raise typer.BadParameter("--password cannot be combined with --encrypted / --encrypted 不支持 --password")
+        decrypt_extract(zip_path, extract_dir)
+    else:
+        unzip_file(zip_path, extract_dir, password=password)
+    typer.echo(extract_dir)
+
+
+# --------------------
+# 名字转换
+# --------------------
+@app.command()
+def name(
+        names: Annotated[Optional[list[str]], typer.Argument(help="Chinese full names / 中文全名")] = None,
+        csv_in: Annotated[Optional[str], typer.Option("--csv-in", help="Input CSV / 输入 CSV")] = None,
+        csv_out: Annotated[Optional[str], typer.Option("--csv-out", help="Output CSV / 输出 CSV")] = None,
+        column: Annotated[str, typer.Option(help="Name column in CSV / CSV 中文名列")] = "name",
+        workers: Annotated[int, typer.Option(help="Worker processes / 进程数")] = 1
+):
+    """Convert Chinese names to 'given.surname'. 中文名转英文名"""
+    from utils.helpers import fullname_cn2en_batch, fullname_cn2en_csv
+
+    if csv_in:
+        if not csv_out:
+            raise typer.BadParameter("--csv-out is required with --csv-in")
+        count = fullname_cn2en_csv(csv_in, csv_out, column, workers=workers)
+        typer.echo(f"{count} rows -> {csv_out}")
+        return
+    # 未给出名字时从标准输入逐行读取，便于管道处理
+    source = names or (line.rstrip("\n") for line in sys.stdin)
+    for english_name in fullname_cn2en_batch(source, workers=workers):
+        typer.echo(english_name)
+
+
+# --------------------
+# 日志索引与查询
+# --------------------
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise typer.BadParameter(f"'{value}' is not an ISO time, e.g. 2024-01-31 or '2024-01-31 12:00:00'")
+
+
+@logs_app.command("index")
+def logs_index(
+        log_dir: Annotated[str, typer.Option("--dir", help="Log directory / 日志目录")] = "logs"
+):
+    """Build or update sidecar indexes for every log file. 为日志文件建立或更新索引"""
+    from utils.logindex import build_indexes
+
+    for path, blocks in build_indexes(log_dir).items():
+        typer.echo(f"{path}: {blocks} blocks")
+
+
+@logs_app.command("query")
+def logs_query(
+        tag: Annotated[Optional[str], typer.Option(help="Tag such as EXCEPTION, TIMER, CALL / 标签")] = None,
+        func: Annotated[Optional[str], typer.Option(help="Function name / 函数名")] = None,
+        level: Annotated[Optional[str], typer.Option(help="Minimum level / 最低级别")] = None,
+        since: Annotated[Optional[str], typer.Option(help="ISO start time / 开始时间")] = None,
+        until: Annotated[Optional[str], typer.Option(help="ISO end time / 结束时间")] = None,
+        min_duration: Annotated[Optional[float], typer.Option(help="Minimum [TIMER] seconds / 最小耗时（秒）")] = None,
+        contains: Annotated[Optional[str], typer.Option(help="Message substring / 消息包含的子串")] = None,
+        limit: Annotated[Optional[int], typer.Option(help="Stop after N matches / 最多输出条数")] = None,
+        log_dir: Annotated[str, typer.Option("--dir", help="Log directory / 日志目录")] = "logs",
+        log_format: Annotated[str, typer.Option(
+            "--format", help="auto (jsonl if present, else text), jsonl, text or all / 日志格式")] = "auto",
+        no_index: Annotated[bool, typer.Option("--no-index", help="Linear scan, ignore indexes / 全量扫描")] = False
+):
+    """Query logs through sidecar indexes and mmap reads. 基于索引查询日志"""
+    from utils.logindex import LogQuery, log_files, query_logs
+
+    try:
+        query = LogQuery(tag=tag, func=func, min_level=level, since=_parse_time(since), until=_parse_time(until),
+                         min_duration=min_duration, contains=contains)
+        paths = log_files(log_dir, log_format)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    stats: dict = {}
+    matches = 0
+    for _, _, text in query_logs(query, paths, use_index=not no_index, stats=stats):
+        typer.echo(text, nl=False)
+        matches += 1
+        if limit is not None and matches >= limit:
+            break
+    typer.echo(f"[LOGS] {matches} matches, {stats.get('files', 0)} files, "
+               f"{stats.get('blocks_scanned', 0)}/{stats.get('blocks', 0)} blocks, "
+               f"{stats.get('bytes_scanned', 0) / 1024:.0f} KiB scanned", err=True)
+
+
 def main():
-    core_init()
+    app()
 
 
 if __name__ == "__main__":
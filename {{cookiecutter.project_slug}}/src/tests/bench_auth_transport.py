@@ -0,0 +1,67 @@
+"""
+File: bench_auth_transport.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Compare AuthClient latency over TCP, Unix domain socket and in-process transports.
+
+Usage:
+    python -m src.tests.bench_auth_transport [requests] [stub_latency_ms]
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+import statistics
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # auth_client 使用顶层 import utils.metrics
+
+from src.core.auth_client import AuthClient
+from src.core.auth_stub import AuthStubServer
+from src.core.auth_transport import InProcessTransport
+
+API_PATH = "/api/fastdem/v1"
+
+
+def measure(client: AuthClient, requests: int) -> list[float]:
+    """Sorted per-call latencies of is_authorized in microseconds. 单次调用延迟（微秒，已排序）"""
+    for _ in range(min(requests // 10, 100)):
+        client.is_authorized(API_PATH)  # 预热：建立连接
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.is_authorized(API_PATH)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return latencies
+
+
+def compare_transports(requests: int = 2_000, latency_ms: float = 0.0) -> dict[str, list[float]]:
+    """Run the same stub decisions over each transport. 同一替身服务分别经 TCP / UDS / 进程内调用"""
+    logging.getLogger("AuthClient").setLevel(logging.WARNING)
+    sock_path = os.path.join(tempfile.mkdtemp(prefix="bench_auth_"), "lanauthgate.sock")
+    with AuthStubServer(latency_ms=latency_ms) as tcp, \
+            AuthStubServer(latency_ms=latency_ms, unix_socket=sock_path) as uds:
+        results = {
+            "tcp": measure(AuthClient(tcp.base_url), requests),
+            "uds": measure(AuthClient(uds.base_url), requests),
+            "inproc": measure(AuthClient(transport=InProcessTransport(tcp.decide)), requests),
+        }
+    os.rmdir(os.path.dirname(sock_path))
+    return results
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+
+    print(f"{total} sequential is_authorized calls per transport, stub latency {latency} ms")
+    print(f"{'transport':<10} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'mean us':>10} {'vs tcp':>8}")
+    results = compare_transports(total, latency)
+    tcp_p50 = statistics.median(results["tcp"])
+    for name, values in results.items():
+        p50 = statistics.median(values)
+        print(f"{name:<10} {p50:10.1f} {values[int(len(values) * 0.9)]:10.1f} "
+              f"{values[int(len(values) * 0.99) - 1]:10.1f} {statistics.fmean(values):10.1f} {tcp_p50 / p50:7.1f}x")
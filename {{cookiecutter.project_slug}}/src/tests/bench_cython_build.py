@@ -0,0 +1,60 @@
+"""
+File: bench_cython_build.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Compare pure-Python and Cython-compiled builds of the same helpers.
+
+Usage:
+    python setup.py build_ext --inplace
+    python -m src.tests.bench_cython_build [loops]
+"""
+import os
+import sys
+import timeit
+import importlib.util
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_pure_python(name, path):
+    """绕过已编译扩展，直接从 .py 源文件加载模块"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+CASES = [
+    ("safe_divide", lambda m: m.safe_divide(10.0, 3.0)),
+    ("clamp", lambda m: m.clamp(15.0, 0.0, 10.0)),
+    ("truncate", lambda m: m.truncate("cookiecutter-fastx-cpython", 10)),
+    ("fullname_cn2en", lambda m: m.fullname_cn2en("欧阳修")),
+    ("fullname_batch(100)", lambda m: sum(1 for _ in m.fullname_cn2en_batch(["欧阳修", "张三"] * 50))),
+    ("iter_files(src)", lambda m: sum(1 for _ in m.iter_files(SRC_DIR, suffixes={".py"}))),
+    ("iter_files(exclude)", lambda m: sum(1 for _ in m.iter_files(SRC_DIR, exclude=["*/__pycache__", "*.c"]))),
+]
+
+
+if __name__ == "__main__":
+    loops = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sys.path.insert(0, SRC_DIR)
+
+    pure = load_pure_python("helpers_pure", os.path.join(SRC_DIR, "utils", "helpers.py"))
+    from utils import helpers as compiled
+
+    if compiled.__file__.endswith(".py"):
+        print("utils.helpers is not compiled, run `python setup.py build_ext --inplace` first")
+        sys.exit(1)
+
+    print(f"compiled: {os.path.basename(compiled.__file__)}")
+    print(f"{'function':<20} {'python (us)':>12} {'cython (us)':>12} {'speedup':>8}")
+    for name, case in CASES:
+        n = loops
+        if name.startswith("iter_files"):
+            n = max(loops // 1000, 10)
+        elif "batch" in name:
+            n = max(loops // 100, 10)
+        t_pure = min(timeit.repeat(lambda: case(pure), number=n, repeat=3)) / n * 1e6
+        t_comp = min(timeit.repeat(lambda: case(compiled), number=n, repeat=3)) / n * 1e6
+        print(f"{name:<20} {t_pure:12.3f} {t_comp:12.3f} {t_pure / t_comp:7.2f}x")
@@ -0,0 +1,56 @@
+"""
+File: bench_fullname_cn2en.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Names/sec benchmark for fullname_cn2en and fullname_cn2en_batch.
+
+Usage:
+    python -m src.tests.bench_fullname_cn2en [count] [workers]
+"""
+import os
+import sys
+import time
+import random
+from pypinyin import pinyin, Style
+from src.utils.helpers import fullname_cn2en_batch
+
+SURNAMES = "王李张刘陈杨赵黄周吴徐孙胡朱高林何郭马罗"
+DOUBLE = ["欧阳", "上官", "司马", "诸葛", "慕容"]
+GIVEN = "伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀兰霞平刚桂英华建国志强文博宇轩"
+
+
+def legacy_fullname_cn2en(chinese_name):
+    """旧实现：每次重建复姓集合，并调用两次 pinyin"""
+    double_surname = {"欧阳", "上官", "司马", "诸葛", "慕容", "东方", "独孤", "南宫"}
+    if len(chinese_name) >= 2 and chinese_name[:2] in double_surname:
+        surname, given_name = chinese_name[:2], chinese_name[2:]
+    else:
+        surname, given_name = chinese_name[0], chinese_name[1:]
+    surname_pinyin = pinyin(surname, style=Style.NORMAL)[0][0]
+    given_name_pinyin = ''.join([p[0] for p in pinyin(given_name, style=Style.NORMAL)])
+    return f"{given_name_pinyin}.{surname_pinyin}".lower()
+
+
+def random_names(count, seed=42):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        surname = rnd.choice(DOUBLE) if rnd.random() < 0.05 else rnd.choice(SURNAMES)
+        yield surname + "".join(rnd.choice(GIVEN) for _ in range(rnd.randint(1, 2)))
+
+
+def bench(name, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {count:>9} names  {elapsed:8.3f} s  {count / elapsed:12.0f} names/s")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 4)
+
+    bench("legacy fullname_cn2en", lambda: [legacy_fullname_cn2en(n) for n in random_names(count)], count)
+    bench("batch serial", lambda: sum(1 for _ in fullname_cn2en_batch(random_names(count))), count)
+    bench(f"batch workers={workers}",
+          lambda: sum(1 for _ in fullname_cn2en_batch(random_names(count), workers=workers)), count)
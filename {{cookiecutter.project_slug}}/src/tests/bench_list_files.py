@@ -0,0 +1,61 @@
+"""
+File: bench_list_files.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Benchmark iter_files (os.scandir) against the listdir + isfile implementation.
+
+Usage:
+    python -m src.tests.bench_list_files [total_files] [files_per_dir] [workers]
+    默认在临时目录生成 1,000,000 个文件（每目录 1000 个）
+"""
+import os
+import sys
+import time
+import tempfile
+from src.utils.helpers import iter_files, remove_dir
+
+
+def legacy_list_files(path, suffix=""):
+    """旧实现：os.listdir + os.path.isfile，按目录逐层调用"""
+    result = []
+    for root, _, _ in os.walk(path):
+        result.extend(os.path.join(root, f) for f in os.listdir(root)
+                      if os.path.isfile(os.path.join(root, f)) and f.endswith(suffix))
+    return result
+
+
+def build_tree(root, total_files, files_per_dir):
+    """生成测试目录树：两级目录，每个叶子目录 files_per_dir 个空文件"""
+    for i in range(total_files):
+        leaf = os.path.join(root, f"d{i // (files_per_dir * 100):03d}", f"d{i // files_per_dir:05d}")
+        if i % files_per_dir == 0:
+            os.makedirs(leaf, exist_ok=True)
+        with open(os.path.join(leaf, f"f{i:07d}{'.py' if i % 2 else '.txt'}"), "wb"):
+            pass
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {count:>10} files  {elapsed:8.3f} s  {count / elapsed:12.0f} files/s")
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_dir = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 4)
+
+    tmp = tempfile.mkdtemp(prefix="bench_list_files_")
+    try:
+        print(f"Building tree with {total} files in {tmp} ...")
+        build_tree(tmp, total, per_dir)
+
+        bench("legacy listdir+isfile", lambda: len(legacy_list_files(tmp)))
+        bench("iter_files serial", lambda: sum(1 for _ in iter_files(tmp)))
+        bench(f"iter_files workers={workers}", lambda: sum(1 for _ in iter_files(tmp, workers=workers)))
+        bench("legacy suffix='.py'", lambda: len(legacy_list_files(tmp, ".py")))
+        bench("iter_files suffixes={'.py'}", lambda: sum(1 for _ in iter_files(tmp, suffixes={".py"})))
+    finally:
+        remove_dir(tmp)
@@ -0,0 +1,85 @@
+"""
+File: bench_log_query.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Benchmark indexed log queries (sidecar index + mmap) against a linear scan.
+
+通过 loguru 写出带轮转的 JSON-lines 与文本日志，模拟 log_func_call / timer 的输出，
+再分别用索引与全量扫描执行几类典型查询，比较耗时与扫描字节数。
+
+Usage:
+    python -m src.tests.bench_log_query [records] [rotation_mb]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from loguru import logger
+
+from src.utils.logindex import LogQuery, add_jsonl_sink, build_indexes, log_files, query_logs, INDEX_SUFFIX
+
+
+def generate(log_dir, records, rotation_mb):
+    sinks = [add_jsonl_sink(logger, os.path.join(log_dir, "app.jsonl"), rotation=f"{rotation_mb} MB"),
+             logger.add(os.path.join(log_dir, "app.log"), rotation=f"{rotation_mb} MB", encoding="utf-8")]
+    tail_since = None
+    try:
+        for i in range(records):
+            func = f"func_{i % 200}"
+            logger.info(f"[CALL] {func} called with args=({i},)")
+            logger.info(f"[RETURN] {func} returned {i * 2}")
+            logger.info(f"[TIMER] Function '{func}' executed in {(i * 7919) % 5000 / 10:.3f} ms")
+            if i % 20000 == 11:
+                logger.error(f"[EXCEPTION] {func} raised an exception: ValueError({i})")
+            if i == records * 99 // 100:
+                tail_since = time.time()
+    finally:
+        for sink in sinks:
+            logger.remove(sink)
+    return tail_since
+
+
+def bench(name, query, paths):
+    results = {}
+    for use_index in (False, True):
+        stats = {}
+        start = time.perf_counter()
+        matches = sum(1 for _ in query_logs(query, paths, use_index=use_index, stats=stats))
+        results[use_index] = (time.perf_counter() - start, matches, stats["bytes_scanned"])
+    (linear_s, linear_n, linear_b), (index_s, index_n, index_b) = results[False], results[True]
+    assert linear_n == index_n, (name, linear_n, index_n)
+    print(f"{name:<32} {index_n:>8} {linear_s * 1000:10.1f} {index_s * 1000:10.1f} {linear_s / index_s:8.1f}x "
+          f"{linear_b / 2 ** 20:9.1f} {index_b / 2 ** 20:9.1f}")
+
+
+if __name__ == "__main__":
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rotation_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    logger.remove()  # 只写入下面的文件 sink，不输出到终端
+    log_dir = tempfile.mkdtemp(prefix="bench_log_query_")
+    try:
+        start = time.perf_counter()
+        tail_since = generate(log_dir, records, rotation_mb)
+        print(f"generated {records * 3} records in {time.perf_counter() - start:.1f}s -> {log_dir}")
+
+        start = time.perf_counter()
+        build_indexes(log_dir)
+        build_s = time.perf_counter() - start
+        for suffix in (".jsonl", ".log"):
+            paths = [p for p in log_files(log_dir) if suffix in os.path.basename(p)]
+            log_mb = sum(os.path.getsize(p) for p in paths) / 2 ** 20
+            idx_kb = sum(os.path.getsize(p + INDEX_SUFFIX) for p in paths) / 1024
+            print(f"\n{suffix}: {len(paths)} files, {log_mb:.1f} MB, index {idx_kb:.0f} KB (all indexes built in {build_s:.1f}s)")
+            print(f"{'query':<32} {'matches':>8} {'linear ms':>10} {'index ms':>10} {'speedup':>9} "
+                  f"{'linear MB':>9} {'index MB':>9}")
+            bench("tag=EXCEPTION", LogQuery(tag="EXCEPTION"), paths)
+            bench("level>=ERROR", LogQuery(min_level="ERROR"), paths)
+            bench("func=func_7 tag=TIMER >=490ms", LogQuery(tag="TIMER", func="func_7", min_duration=0.49), paths)
+            bench("since last 1%", LogQuery(since=tail_since), paths)
+            bench("func=func_7 (all tags)", LogQuery(func="func_7"), paths)
+    finally:
+        shutil.rmtree(log_dir)
@@ -0,0 +1,365 @@
+"""
+File: bench_suite.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Benchmark suite with JSON results and baseline regression check.
+
+Usage:
+    python -m src.tests.bench_suite                                   # 运行全部，结果写入 bench_results.json
+    python -m src.tests.bench_suite --save-baseline                   # 运行并保存为基线
+    python -m src.tests.bench_suite --baseline bench_baseline.json --threshold 0.15
+    python -m src.tests.bench_suite --only decorators aes             # 只运行部分基准
+
+有指标比基线差超过 threshold（相对比例）时，退出码为 1，可直接用于 CI。
+开销类指标（包装后减去裸调用，接近 0）另有绝对容差 --overhead-tolerance，
+即允许的变化为 threshold * |基线| + 容差，避免噪声在接近 0 的基线上放大成巨大的相对变化。
+"""
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from typing import Callable
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # decorators / helpers 使用顶层 import config
+
+from src.utils.helpers import (
+    aes_encrypt_bytes, aes_encrypt_file, zip_dir, unzip_file, list_files, iter_files, remove_dir
+)
+from src.tests.bench_list_files import build_tree
+
+DEFAULT_RESULTS = "bench_results.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+
+# --------------------
+# 基准注册
+# --------------------
+# 每个基准返回 {metric_name: (value, unit, higher_is_better[, absolute_tolerance])}
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], dict]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark function under a group name. 注册基准函数"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def per_call_us(func: Callable, number: int) -> float:
+    """Best of 3 runs, microseconds per call. 三次取最优，返回每次调用微秒数"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of a sorted list, q in (0, 100]. 已排序序列的最近秩分位数"""
+    n = len(sorted_values)
+    return sorted_values[min(n - 1, math.ceil(q / 100 * n) - 1)]
+
+
+def throughput_mb_s(func: Callable, nbytes: int, repeat: int = 3) -> float:
+    best = min(_elapsed(func) for _ in range(repeat))
+    return nbytes / best / (1024 * 1024)
+
+
+def _elapsed(func: Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+# --------------------
+# 装饰器开销
+# --------------------
+def _noop(x):
+    return x
+
+
+def _decorator_overhead(number: int) -> tuple[float, float]:
+    """
+    Run in a child process: returns (timer, log_func_call) overhead in us/call.
+    在子进程中执行：日志只输出到空 sink（只测装饰器与格式化开销，不测终端/磁盘 I/O），
+    移除 sink 只影响子进程，本进程 config 配置的 sink 保持不变
+    """
+    from config import logger
+    from src.decorators import timer, log_func_call
+
+    logger.remove()
+    logger.add(lambda message: None, level="INFO")
+
+    base = per_call_us(lambda: _noop(1), number)
+    timed = timer(unit="ms")(_noop)
+    logged = log_func_call()(_noop)
+    return per_call_us(lambda: timed(1), number) - base, per_call_us(lambda: logged(1), number) - base
+
+
+@benchmark("decorators")
+def bench_decorators(args):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        timer_us, log_us = executor.submit(_decorator_overhead, args.calls).result()
+    tolerance = args.overhead_tolerance
+    return {
+        "timer_overhead": (timer_us, "us/call", False, tolerance),
+        "log_func_call_overhead": (log_us, "us/call", False, tolerance),
+    }
+
+
+# --------------------
+# tracing 开销
+# --------------------
+@benchmark("tracing")
+def bench_tracing(args):
+    from src.utils import tracing
+
+    def noop():
+        with tracing.span("noop"):
+            pass
+
+    number = args.calls
+    base = per_call_us(lambda: None, number)
+    was_enabled = tracing.is_enabled()
+    try:
+        tracing.disable()
+        disabled = per_call_us(noop, number) - base
+        tracing.enable()
+        enabled = per_call_us(noop, number) - base
+    finally:
+        if not was_enabled:
+            tracing.disable()
+        tracing.clear()
+    tolerance = args.overhead_tolerance
+    return {
+        "span_overhead_disabled": (disabled, "us/call", False, tolerance),
+        "span_overhead_enabled": (enabled, "us/call", False, tolerance),
+    }
+
+
+# --------------------
+# AES 吞吐
+# --------------------
+@benchmark("aes")
+def bench_aes(args):
+    size = args.aes_mb * 1024 * 1024
+    data = os.urandom(size)
+    results = {"aes_encrypt_bytes": (throughput_mb_s(lambda: aes_encrypt_bytes(data), size), "MB/s", True)}
+
+    with tempfile.TemporaryDirectory(prefix="bench_aes_") as tmp:
+        src, dst = os.path.join(tmp, "plain.bin"), os.path.join(tmp, "cipher.bin")
+        with open(src, "wb") as f:
+            f.write(data)
+        results["aes_encrypt_file"] = (throughput_mb_s(lambda: aes_encrypt_file(src, dst), size), "MB/s", True)
+    return results
+
+
+# --------------------
+# 压缩/解压吞吐
+# --------------------
+@benchmark("archive")
+def bench_archive(args):
+    with tempfile.TemporaryDirectory(prefix="bench_archive_") as tmp:
+        folder = os.path.join(tmp, "data")
+        os.makedirs(folder)
+        # 半随机半重复内容，接近真实数据的压缩率
+        chunk = os.urandom(32 * 1024) + b"0123456789abcdef" * 2048
+        total = 0
+        for i in range(args.archive_files):
+            with open(os.path.join(folder, f"f{i:05d}.bin"), "wb") as f:
+                f.write(chunk)
+            total += len(chunk)
+
+        zip_path = os.path.join(tmp, "data.zip")
+        zip_mb_s = throughput_mb_s(lambda: zip_dir(folder, zip_path), total, repeat=1)
+        unzip_mb_s = throughput_mb_s(lambda: unzip_file(zip_path, os.path.join(tmp, "out")), total, repeat=1)
+    return {
+        "zip_dir": (zip_mb_s, "MB/s", True),
+        "unzip_file": (unzip_mb_s, "MB/s", True),
+    }
+
+
+# --------------------
+# 文件遍历
+# --------------------
+@benchmark("list_files")
+def bench_list_files(args):
+    tmp = tempfile.mkdtemp(prefix="bench_suite_files_")
+    try:
+        build_tree(tmp, args.tree_files, 1000)
+        flat = os.path.join(tmp, "d000", "d00000")  # 单个宽目录（1000 个文件）
+
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_files(tmp))
+        serial = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_files(tmp, workers=os.cpu_count() or 4))
+        parallel = count / (time.perf_counter() - start)
+
+        return {
+            "list_files_flat": (per_call_us(lambda: list_files(flat), 100), "us/call", False),
+            "iter_files_serial": (serial, "files/s", True),
+            "iter_files_parallel": (parallel, "files/s", True),
+        }
+    finally:
+        remove_dir(tmp)
+
+
+# --------------------
+# AuthClient
+# --------------------
+@benchmark("auth_client")
+def bench_auth_client(args):
+    from src.core.auth_client import AuthClient
+    from src.core.auth_stub import AuthStubServer
+
+    stub = AuthStubServer().start()
+    base_url = stub.base_url
+    logging.getLogger("AuthClient").setLevel(logging.WARNING)
+    try:
+        client = AuthClient(base_url)
+        client.is_authorized("/api/warmup")
+
+        latencies = []
+        for _ in range(args.auth_requests):
+            start = time.perf_counter()
+            client.is_authorized("/api/fastdem/v1")
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        # 多线程吞吐：每个线程独立客户端（requests.Session 非线程安全）
+        threads, per_thread = args.auth_threads, max(args.auth_requests // args.auth_threads, 1)
+
+        def worker():
+            c = AuthClient(base_url)
+            for _ in range(per_thread):
+                c.is_authorized("/api/fastdem/v1")
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        rps = threads * per_thread / (time.perf_counter() - start)
+
+        return {
+            "auth_latency_p50": (statistics.median(latencies), "ms", False),
+            "auth_latency_p99": (percentile(latencies, 99), "ms", False),
+            "auth_throughput": (rps, "req/s", True),
+        }
+    finally:
+        stub.stop()
+
+
+@benchmark("auth_transport")
+def bench_auth_transport(args):
+    from src.tests.bench_auth_transport import compare_transports
+
+    results = compare_transports(args.auth_requests)
+    return {
+        f"auth_{name}_p50": (statistics.median(values), "us", False)
+        for name, values in results.items()
+    }
+
+
+# --------------------
+# 结果与基线比较
+# --------------------
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Return regression messages for metrics worse than baseline by more than
+    threshold * |baseline| + the metric's absolute tolerance. 返回超过允许变化的退化项
+    """
+    regressions = []
+    for name, metric in results["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if not base:
+            continue
+        # worse > 0 表示变差，单位与指标相同
+        worse = base["value"] - metric["value"] if metric["higher_is_better"] else metric["value"] - base["value"]
+        allowed = threshold * abs(base["value"]) + metric.get("tolerance", 0.0)
+        marker = "REGRESSION" if worse > allowed else ""
+        print(f"  {name:<28} {base['value']:12.3f} -> {metric['value']:12.3f} {metric['unit']:<8} "
+              f"worse by {worse:+10.3f} (allowed {allowed:.3f}) {marker}")
+        if marker:
+            regressions.append(f"{name}: worse by {worse:.3f} {metric['unit']} (allowed {allowed:.3f})")
+    return regressions
+
+
+def run(args) -> dict:
+    metrics = {}
+    for name, func in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"[BENCH] {name} ...")
+        for metric, (value, unit, higher_is_better, *tolerance) in func(args).items():
+            metrics[metric] = {"value": value, "unit": unit, "higher_is_better": higher_is_better,
+                               "tolerance": tolerance[0] if tolerance else 0.0}
+            print(f"  {metric:<28} {value:12.3f} {unit}")
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="results JSON path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression, e.g. 0.2 = 20%%")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmark groups")
+    parser.add_argument("--calls", type=int, default=20_000, help="calls for per-call overhead")
+    parser.add_argument("--overhead-tolerance", type=float, default=0.25,
+                        help="absolute tolerance in us/call for overhead metrics (wrapped minus bare call)")
+    parser.add_argument("--aes-mb", type=int, default=16, help="payload size for AES benchmarks")
+    parser.add_argument("--archive-files", type=int, default=500, help="files for zip benchmarks")
+    parser.add_argument("--tree-files", type=int, default=100_000, help="files for list_files benchmarks")
+    parser.add_argument("--auth-requests", type=int, default=2_000, help="requests for AuthClient benchmarks")
+    parser.add_argument("--auth-threads", type=int, default=8, help="threads for AuthClient throughput")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, skip comparison (use --save-baseline)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"Compare with baseline {args.baseline} ({baseline.get('timestamp')}):")
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"[REGRESSION] {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # 与应用一致使用顶层包名，指标注册表只加载一份
+
+from core.auth_client import AuthClient
+from core.auth_stub import AuthStubServer
+from core.auth_transport import InProcessTransport
+from utils.metrics import REGISTRY
+
+
+def test_in_process_transport():
+    client = AuthClient(transport=InProcessTransport(lambda path: path == "/api/allowed"))
+    assert client.is_authorized("/api/allowed")
+    assert client.is_authorized("api/allowed", "get")
+    assert not client.is_authorized("/api/other")
+    assert client.health_check()
+
+
+def test_unix_socket_transport(tmp_path):
+    sock = str(tmp_path / "auth.sock")
+    with AuthStubServer(decisions={"/api/denied": False}, unix_socket=sock) as stub:
+        client = AuthClient(stub.base_url)
+        assert client.check_auth("/api/fastdem/v1")["authorized"]
+        assert not client.is_authorized("/api/denied", "get")
+        assert client.health_check()
+    assert not os.path.exists(sock)
+
+
+class _RawBodyHandler(BaseHTTPRequestHandler):
+    body = b""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.parametrize("body", [b"", b"<html>502 Bad Gateway</html>", b"[]"])
+def test_malformed_success_body_is_a_request_error(body):
+    handler = type("Handler", (_RawBodyHandler,), {"body": body})
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    errors = REGISTRY.counter("auth_requests_total").labels("post", "error")
+    before = errors.snapshot()
+    try:
+        client = AuthClient(f"http://127.0.0.1:{server.server_port}")
+        with pytest.raises(requests.JSONDecodeError):
+            client.check_auth("/api/x")
+        assert errors.snapshot() == before + 1
+        assert not client.is_authorized("/api/x")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stub_decisions_errors_and_request_counts():
+    with AuthStubServer(decisions={"/api/denied": False}, error_rate=0.0) as stub:
+        client = AuthClient(stub.base_url)
+        assert client.is_authorized("/api/any")
+        assert not client.is_authorized("api/denied", "get")
+        assert client.health_check()
+        assert sum(stub.requests.values()) == 3
+    with AuthStubServer(error_rate=1.0) as stub:
+        client = AuthClient(stub.base_url)
+        with pytest.raises(requests.HTTPError):
+            client.check_auth("/api/any")
+        assert not client.is_authorized("/api/any")
+
+
+@pytest.mark.parametrize("transport", ["tcp", "unix"])
+def test_http_error_carries_status_code(transport, tmp_path):
+    unix_socket = str(tmp_path / "auth.sock") if transport == "unix" else None
+    for options, status in (({"login_required": True}, 401), ({"error_rate": 1.0}, 500)):
+        with AuthStubServer(unix_socket=unix_socket, **options) as stub:
+            client = AuthClient(stub.base_url)
+            with pytest.raises(requests.HTTPError) as info:
+                client.check_auth("/api/any")
+            assert info.value.response.status_code == status
+            assert info.value.response.url == stub.base_url + "/api/auth/check"
+            assert not client.is_authorized("/api/any", "get")
+    assert AuthClient("http://127.0.0.1:1").session is not None  # TCP 传输保留 requests.Session
+
+
+def test_load_generator_report():
+    from core.auth_loadgen import run_load
+
+    with AuthStubServer(error_rate=0.3, seed=1) as stub:
+        report = run_load(stub.base_url, threads=4, requests_per_thread=25, shared_client=True, pool_size=4,
+                          rate_limit={"max_concurrent": 2})
+    latency = report["latency_ms"]
+    assert report["requests"] == 100 and 0 < report["errors"] < 100
+    assert latency["min"] <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+    assert report["throughput_rps"] > 0 and report["rate_limit"]["rejected"] == 0
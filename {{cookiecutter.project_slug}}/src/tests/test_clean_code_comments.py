@@ -0,0 +1,43 @@
+import os
+import sys
+import importlib.util
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                      "scripts", "clean_code_comments.py")
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("clean_code_comments", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # 进程池按模块名 pickle 任务函数
+    spec.loader.exec_module(module)
+    return module
+
+
+def _code(path):
+    """去掉空白后比较：untokenize 的兼容模式会改变 token 间距"""
+    return "".join(path.read_text().split())
+
+
+def test_incremental_clean_skips_unchanged_files(tmp_path):
+    clean = _load_script()
+    src, out = tmp_path / "src", tmp_path / "out"
+    (src / "pkg").mkdir(parents=True)
+    (src / "a.py").write_text('"""module doc"""\n\nx = 1  # comment\n')
+    (src / "pkg" / "b.py").write_text("def f():\n    \"\"\"doc\"\"\"\n    return 2\n")
+    (src / "pkg" / "broken.py").write_text("def f(:\n    '''\n")
+
+    assert clean.process_directory_recursive(str(src), str(out), [], workers=2) == (2, 0, 1)
+    assert _code(out / "a.py") == "x=1"
+    assert _code(out / "pkg" / "b.py") == "deff():return2"
+
+    # 第二次运行：内容未变化的文件全部跳过；修改一个文件后只重新处理它
+    assert clean.process_directory_recursive(str(src), str(out), [], workers=1) == (0, 2, 1)
+    (src / "a.py").write_text("y = 2  # changed\n")
+    assert clean.process_directory_recursive(str(src), str(out), [], workers=1) == (1, 1, 1)
+    assert _code(out / "a.py") == "y=2"
+
+    # 输出被删除或使用 incremental=False 时重新处理
+    os.remove(out / "pkg" / "b.py")
+    assert clean.process_directory_recursive(str(src), str(out), ["broken.py"], workers=1) == (1, 1, 0)
+    assert clean.process_directory_recursive(str(src), str(out), ["broken.py"], incremental=False) == (2, 0, 0)
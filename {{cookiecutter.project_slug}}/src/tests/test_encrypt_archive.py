@@ -0,0 +1,59 @@
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # AES 函数使用顶层 import config
+
+from src.utils.helpers import encrypt_archive, decrypt_extract, aes_decrypt_file, unzip_file
+
+
+def _tree(root):
+    return {
+        os.path.relpath(os.path.join(d, f), root): open(os.path.join(d, f), "rb").read()
+        for d, _, files in os.walk(root) for f in files
+    }
+
+
+def test_stream_roundtrip_and_legacy_compat(tmp_path):
+    src = tmp_path / "pkg"
+    (src / "sub" / "中文").mkdir(parents=True)
+    (src / "random.bin").write_bytes(os.urandom(300_000))
+    (src / "sub" / "text.txt").write_bytes(b"line\n" * 100_000)
+    (src / "sub" / "中文" / "empty").write_bytes(b"")
+
+    enc = encrypt_archive(str(src), str(tmp_path / "pkg.zip.enc"), buffer_size=4096)
+    assert decrypt_extract(enc, str(tmp_path / "out"), buffer_size=1000) == 3
+    assert _tree(str(tmp_path / "out")) == _tree(str(src))
+
+    # 与两步方式的格式兼容：先整体解密，再按普通 zip 解压
+    aes_decrypt_file(enc, str(tmp_path / "pkg.zip"))
+    unzip_file(str(tmp_path / "pkg.zip"), str(tmp_path / "legacy"))
+    assert _tree(str(tmp_path / "legacy")) == _tree(str(src))
+
+
+def test_member_paths_cannot_escape_extract_dir(tmp_path):
+    import zipfile
+    import pytest
+    from src.utils.helpers import _safe_member_path, aes_encrypt_file
+
+    root = str(tmp_path / "out")
+    assert _safe_member_path(root, "C:/x.txt") == os.path.join(root, "x.txt")
+    assert _safe_member_path(root, "//server/share/a\\b.txt") == os.path.join(root, "a", "b.txt")
+    for name in ("../evil", "a/../../evil", "C:..\\evil", "C:/../evil", "\\..\\evil", ""):
+        with pytest.raises(zipfile.BadZipFile):
+            _safe_member_path(root, name)
+
+    # 端到端：带盘符的条目解压到目录内，穿越条目整体拒绝
+    for names, ok in ((["C:/x.txt"], True), (["ok.txt", "C:..\\evil.txt"], False)):
+        plain, enc = str(tmp_path / "m.zip"), str(tmp_path / "m.zip.enc")
+        with zipfile.ZipFile(plain, "w") as zf:
+            for name in names:
+                zf.writestr(zipfile.ZipInfo(name), b"data")
+        aes_encrypt_file(plain, enc)
+        if ok:
+            assert decrypt_extract(enc, root) == 1
+            assert open(os.path.join(root, "x.txt"), "rb").read() == b"data"
+        else:
+            with pytest.raises(zipfile.BadZipFile):
+                decrypt_extract(enc, root)
+    assert not os.path.exists(tmp_path / "evil.txt")
@@ -0,0 +1,166 @@
+import os
+import sys
+import importlib.util
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from utils import helpers  # 已执行 build_ext 时为编译版本
+
+
+def _pure_helpers():
+    spec = importlib.util.spec_from_file_location("helpers_pure", os.path.join(SRC_DIR, "utils", "helpers.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compiled_and_pure_python_behave_the_same():
+    pure = _pure_helpers()
+    cases = [
+        ("clamp", (5, 0, 10)),
+        ("clamp", (Fraction(1, 3), 0, 1)),
+        ("safe_divide", (Decimal(1), Decimal(3))),
+        ("safe_divide", (1, 0)),
+        ("truncate", ("cookiecutter-fastx-cpython", 10)),
+        ("fullname_cn2en", ("欧阳修",)),
+    ]
+    for name, args in cases:
+        expected = getattr(pure, name)(*args)
+        actual = getattr(helpers, name)(*args)
+        assert actual == expected and type(actual) is type(expected), (name, args, actual, expected)
+
+
+def _make_tree(root):
+    os.makedirs(os.path.join(root, "sub", "deep"))
+    for rel in ("a.txt", os.path.join("sub", "b.txt"), os.path.join("sub", "deep", "c.txt")):
+        with open(os.path.join(root, rel), "w") as f:
+            f.write(rel)
+
+
+def test_copy_tree_incremental_and_symlinks(tmp_path):
+    src, dst, outside = str(tmp_path / "src"), str(tmp_path / "dst"), tmp_path / "outside.txt"
+    _make_tree(src)
+    os.symlink("a.txt", os.path.join(src, "link.txt"))
+    os.symlink("sub", os.path.join(src, "dirlink"))
+    # 目标中已存在指向树外的符号链接：复制不能穿过它写到树外
+    outside.write_text("keep")
+    os.makedirs(dst)
+    os.symlink(str(outside), os.path.join(dst, "a.txt"))
+
+    assert helpers.copy_tree(src, dst, workers=4) == (5, 0)
+    assert outside.read_text() == "keep"
+    assert not os.path.islink(os.path.join(dst, "a.txt"))
+    assert os.readlink(os.path.join(dst, "link.txt")) == "a.txt"
+    assert os.readlink(os.path.join(dst, "dirlink")) == "sub"
+
+    # 第二次运行：未变化的文件与链接全部跳过
+    assert helpers.copy_tree(src, dst, workers=4) == (0, 5)
+
+    changed = os.path.join(src, "sub", "b.txt")
+    with open(changed, "w") as f:
+        f.write("changed content")
+    os.utime(changed, (0, 0))
+    assert helpers.copy_tree(src, dst, workers=4) == (1, 4)
+    with open(os.path.join(dst, "sub", "b.txt")) as f:
+        assert f.read() == "changed content"
+
+    # 同一秒内改写且大小不变：按纳秒 mtime 仍能识别为已变化
+    with open(changed, "w") as f:
+        f.write("CHANGED content")
+    os.utime(changed, ns=(0, 500_000_000))
+    assert helpers.copy_tree(src, dst, workers=4) == (1, 4)
+    with open(os.path.join(dst, "sub", "b.txt")) as f:
+        assert f.read() == "CHANGED content"
+
+    # 目标处同名的是目录：明确报错，而不是 unlink 时的 IsADirectoryError
+    os.remove(os.path.join(dst, "a.txt"))
+    os.makedirs(os.path.join(dst, "a.txt"))
+    with pytest.raises(IsADirectoryError, match="a.txt"):
+        helpers.copy_tree(src, dst, workers=4)
+
+
+def test_remove_dir_parallel(tmp_path):
+    root, keep = str(tmp_path / "tree"), tmp_path / "keep"
+    for i in range(20):
+        _make_tree(os.path.join(root, f"d{i}"))
+    keep.mkdir()
+    (keep / "k.txt").write_text("k")
+    os.symlink(str(keep), os.path.join(root, "d0", "keep_link"))
+
+    helpers.remove_dir(root, workers=4)
+    assert not os.path.exists(root)
+    assert (keep / "k.txt").read_text() == "k"  # 指向目录的链接只删除链接本身
+    helpers.remove_dir(root, workers=4)  # 不存在时直接返回
+
+
+def _walk_files(root, suffixes=(), skip_dirs=()):
+    """原 os.walk 实现的参考结果：相对路径，'/' 分隔"""
+    found = set()
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        for name in files:
+            if not suffixes or name.endswith(tuple(suffixes)):
+                found.add(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"))
+    return found
+
+
+def test_iter_files_matches_os_walk(tmp_path):
+    root = str(tmp_path / "tree")
+    for i in range(6):
+        d = os.path.join(root, f"d{i}", "nested" if i % 2 else "", "x")
+        os.makedirs(d, exist_ok=True)
+        for name in ("a.py", "b.txt", "c.PY"):
+            with open(os.path.join(d, name), "w") as f:
+                f.write(name)
+    os.makedirs(os.path.join(root, "skip"))
+    open(os.path.join(root, "skip", "s.py"), "w").close()
+    open(os.path.join(root, "top.py"), "w").close()
+
+    for workers in (1, 4):
+        assert set(helpers.iter_files(root, workers=workers)) == _walk_files(root)
+        assert set(helpers.iter_files(root, suffixes={".py"}, workers=workers)) == _walk_files(root, {".py"})
+        assert set(helpers.iter_files(root, exclude=["skip"], workers=workers)) == _walk_files(root, skip_dirs={"skip"})
+        assert set(helpers.iter_files(root, recursive=False, workers=workers)) == {"top.py"}
+    assert set(helpers.iter_files(root, absolute=True)) == {os.path.join(root, p) for p in _walk_files(root)}
+    assert sorted(helpers.list_files(root)) == ["top.py"]
+
+
+def test_iter_files_symlinks(tmp_path):
+    root = str(tmp_path / "tree")
+    _make_tree(root)
+    os.symlink("a.txt", os.path.join(root, "file_link.txt"))
+    os.symlink("..", os.path.join(root, "sub", "loop"))  # 指回上级目录，跟随时成环
+
+    for workers in (1, 4):
+        # 不跟随链接：与 os.walk 一致，指向文件的链接作为文件产出，指向目录的链接不进入
+        assert set(helpers.iter_files(root, workers=workers)) == _walk_files(root)
+        assert "file_link.txt" in _walk_files(root)
+        # 跟随链接：每个目录只遍历一次，环不会导致无限遍历
+        assert sorted(helpers.iter_files(root, workers=workers, follow_symlinks=True)) == [
+            "a.txt", "file_link.txt", "sub/b.txt", "sub/deep/c.txt"]
+
+
+def test_fullname_batch_and_csv_match_single_conversion(tmp_path):
+    import csv
+
+    names = ["欧阳修", "诸葛亮", "张三", "", " 李四 ", "司马光"] * 5
+    expected = [helpers.fullname_cn2en(n.strip()) if n.strip() else "" for n in names]
+    assert expected[:3] == ["xiu.ouyang", "liang.zhuge", "san.zhang"]  # 复姓整体作为姓
+    assert list(helpers.fullname_cn2en_batch(names)) == expected
+    assert list(helpers.fullname_cn2en_batch(names, workers=2, chunk_size=4)) == expected
+
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    with open(src, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name"])
+        writer.writerows([i, n] for i, n in enumerate(names))
+    assert helpers.fullname_cn2en_csv(str(src), str(out), "name", workers=2) == len(names)
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["english_name"] for row in rows] == expected
+    assert [row["id"] for row in rows] == [str(i) for i in range(len(names))]
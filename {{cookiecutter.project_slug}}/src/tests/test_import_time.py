@@ -0,0 +1,67 @@
+"""
+File: test_import_time.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Import-time budget for utils.helpers, measured with `python -X importtime`.
+
+默认只检查是否加载了重型依赖；耗时预算仅在设置环境变量 IMPORT_TIME_BUDGET_MS（如 50）时检查，
+避免 CI / 高负载机器上的墙钟抖动导致误报
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = os.environ.get("IMPORT_TIME_BUDGET_MS")
+HEAVY_MODULES = ("pypinyin", "Crypto", "pyzipper", "config", "loguru")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Run `python -X importtime -c 'import <module>'`, return cumulative us per module. 返回各模块累计导入耗时（微秒）"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_helpers_does_not_import_heavy_dependencies():
+    times = import_times("utils.helpers")
+    loaded = [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+    assert not loaded, f"utils.helpers eagerly imports {loaded}"
+
+
+def test_decorators_loads_rate_limit_lazily(tmp_path):
+    # cwd 为临时目录：config 在当前目录下创建 logs/
+    code = (
+        "import sys, types, decorators\n"
+        "assert 'decorators.rate_limit' not in sys.modules\n"
+        "import decorators.rate_limit\n"
+        "from decorators import rate_limit, RateLimiter, RateLimitExceeded\n"
+        "assert not isinstance(rate_limit, types.ModuleType) and RateLimiter.__name__ == 'RateLimiter'\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+
+
+@pytest.mark.skipif(BUDGET_MS is None, reason="set IMPORT_TIME_BUDGET_MS to check the wall-clock budget")
+def test_helpers_import_time_budget():
+    # 取多次运行的最小值，减少磁盘缓存/调度抖动
+    budget_ms = float(BUDGET_MS)
+    best_ms = min(import_times("utils.helpers")["utils.helpers"] for _ in range(3)) / 1000
+    assert best_ms <= budget_ms, f"import utils.helpers took {best_ms:.1f} ms (budget {budget_ms} ms)"
+
+
+if __name__ == "__main__":
+    for name, us in sorted(import_times("utils.helpers").items(), key=lambda kv: -kv[1])[:15]:
+        print(f"{us / 1000:8.2f} ms  {name}")
@@ -0,0 +1,143 @@
+import json
+import os
+
+import pytest
+from loguru import logger
+
+from src.utils.logindex import LogQuery, add_jsonl_sink, build_index, load_index, log_files, query_logs
+
+
+def _write_logs(count):
+    for i in range(count):
+        func = f"func_{i % 50}"
+        logger.info(f"[CALL] {func} called with args=({i},)")
+        logger.info(f"[TIMER] Function '{func}' executed in {i % 1000 / 10:.3f} ms")
+        if i % 500 == 7:
+            try:
+                raise ValueError(i)
+            except ValueError:
+                logger.exception(f"[EXCEPTION] {func} raised an exception: {i}")
+
+
+def _matches(query, path, use_index, stats=None):
+    return [text for _, _, text in query_logs(query, [path], use_index=use_index, stats=stats)]
+
+
+def test_jsonl_and_text_index_match_linear_scan(tmp_path):
+    for name, add in (("app.jsonl", add_jsonl_sink), ("app.log", lambda lg, p: lg.add(p))):
+        path = str(tmp_path / name)
+        sink = add(logger, path)
+        try:
+            _write_logs(2000)
+        finally:
+            logger.remove(sink)
+
+        index = build_index(path, block_size=4096)
+        assert len(index["blocks"]) > 20
+        assert {"CALL", "TIMER", "EXCEPTION"} <= set(index["tags"])
+
+        for query in (LogQuery(tag="EXCEPTION"), LogQuery(tag="[TIMER]", func="func_7", min_duration=0.09),
+                      LogQuery(min_level="ERROR"), LogQuery(func="func_3", contains="called")):
+            stats = {}
+            indexed = _matches(query, path, True, stats)
+            assert indexed == _matches(query, path, False)
+            assert indexed and stats["blocks_scanned"] < stats["blocks"]
+
+        exceptions = _matches(LogQuery(tag="EXCEPTION"), path, True)
+        assert len(exceptions) == 4
+        if name.endswith(".jsonl"):
+            assert "ValueError" in json.loads(exceptions[0])["exception"]
+        else:
+            assert "Traceback" in exceptions[0]  # 文本日志的 traceback 续行属于同一条记录
+
+
+def test_index_updates_incrementally_on_append(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink = add_jsonl_sink(logger, path)
+    try:
+        _write_logs(100)
+        first = build_index(path, block_size=1024)
+        _write_logs(100)
+        # 查询时按追加内容增量更新索引：已写满的块保持不变，末尾未写满的块与新内容合并
+        assert len(_matches(LogQuery(tag="CALL"), path, True)) == 200
+    finally:
+        logger.remove(sink)
+
+    updated = load_index(path)
+    assert updated["blocks"][:len(first["blocks"]) - 1] == first["blocks"][:-1]
+    assert updated["blocks"][len(first["blocks"]) - 1][0] == first["blocks"][-1][0]
+    assert updated["size"] > first["size"]
+
+
+def test_small_appends_do_not_fragment_index(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink = add_jsonl_sink(logger, path)
+    try:
+        for i in range(20):
+            _write_logs(1)
+            assert len(_matches(LogQuery(tag="CALL"), path, True)) == i + 1
+    finally:
+        logger.remove(sink)
+    assert len(load_index(path)["blocks"]) == 1
+
+
+def test_query_uses_in_memory_index_when_index_is_not_writable(tmp_path, monkeypatch):
+    path = str(tmp_path / "app.jsonl")
+    sink = add_jsonl_sink(logger, path)
+    try:
+        _write_logs(10)
+    finally:
+        logger.remove(sink)
+
+    def replace(src, dst):
+        raise PermissionError(dst)
+
+    monkeypatch.setattr(os, "replace", replace)  # 模拟只读的日志目录
+    stats = {}
+    assert len(_matches(LogQuery(tag="CALL"), path, True, stats)) == 10
+    assert stats["blocks"] == 1
+    assert os.listdir(tmp_path) == ["app.jsonl"]
+    with pytest.raises(PermissionError):
+        build_index(path)
+
+
+def test_json_continuation_lines_in_text_log(tmp_path):
+    # 文本日志中打印的 dict / payload 是上一条记录的续行，不是记录，也不能中断建索引
+    path = str(tmp_path / "app.log")
+    sink = logger.add(path)
+    try:
+        logger.info("[CALL] handler called with payload:\n" + json.dumps({"ts": 1, "level": "ERROR"})
+                    + "\n" + json.dumps({"user": "x"}))
+        logger.error("[EXCEPTION] handler raised an exception: boom")
+    finally:
+        logger.remove(sink)
+    jsonl = tmp_path / "app.jsonl"
+    jsonl.write_text(json.dumps({"user": "x"}) + "\n[1, 2]\nnot json\n" + json.dumps(
+        {"ts": 1.0, "level": "ERROR", "tag": "EXCEPTION", "func": "handler", "msg": "boom"}) + "\n")
+
+    for log in (path, str(jsonl)):
+        index = build_index(log)
+        assert index["tags"] and len(index["blocks"]) == 1
+        errors = _matches(LogQuery(min_level="ERROR"), log, True)
+        assert len(errors) == 1 and "boom" in errors[0]
+        assert _matches(LogQuery(tag="EXCEPTION"), log, True) == _matches(LogQuery(tag="EXCEPTION"), log, False)
+    calls = _matches(LogQuery(tag="CALL"), path, True)
+    assert len(calls) == 1 and '"user": "x"' in calls[0]
+
+
+def test_auto_format_prefers_jsonl_when_both_sinks_write(tmp_path):
+    # LOG_JSONL=1：同一批记录同时写入 .log 与 .jsonl
+    sinks = [logger.add(str(tmp_path / "app.log")), add_jsonl_sink(logger, str(tmp_path / "app.jsonl"))]
+    try:
+        _write_logs(10)
+    finally:
+        for sink in sinks:
+            logger.remove(sink)
+
+    assert [os.path.basename(p) for p in log_files(str(tmp_path), "auto")] == ["app.jsonl"]
+    assert [os.path.basename(p) for p in log_files(str(tmp_path), "text")] == ["app.log"]
+    assert len(log_files(str(tmp_path))) == 2
+    for fmt in ("auto", "jsonl", "text"):
+        assert len(list(query_logs(LogQuery(tag="TIMER", func="func_3"), log_files(str(tmp_path), fmt)))) == 1
+    with pytest.raises(ValueError):
+        log_files(str(tmp_path), "xml")
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import threading
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # 与应用及装饰器一致使用顶层包名，全局 REGISTRY 只有一个
+
+from utils.metrics import REGISTRY, MetricsRegistry, write_prometheus
+
+
+def test_counter_is_thread_safe():
+    registry = MetricsRegistry()
+    child = registry.counter("hits_total", "Hits", ["kind"]).labels("a")
+
+    def work():
+        for _ in range(10_000):
+            child.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert registry.snapshot()["hits_total"]["samples"][0]["value"] == 80_000
+
+
+def test_histogram_prometheus_text(tmp_path):
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value)
+
+    text = open(write_prometheus(str(tmp_path / "m.prom"), registry), encoding="utf-8").read()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    json.dumps(registry.snapshot())
+
+
+def test_decorators_record_into_global_registry():
+    from decorators import log_func_call
+
+    @log_func_call()
+    def metered():
+        return 1
+
+    def calls():
+        samples = REGISTRY.snapshot()["function_calls_total"]["samples"]
+        return sum(s["value"] for s in samples if s["labels"].get("func") == metered.__qualname__)
+
+    before = calls()
+    metered()
+    assert calls() == before + 1
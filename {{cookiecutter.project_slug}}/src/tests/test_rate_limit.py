@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # 与应用一致使用顶层包名，指标注册表与异常类只加载一份
+
+from decorators.rate_limit import RateLimiter, RateLimitExceeded, rate_limit
+
+rate_limit_module = sys.modules["decorators.rate_limit"]  # 包属性 decorators.rate_limit 是同名装饰器函数
+
+
+class FakeTime:
+    """替换 rate_limit 模块中的 time：sleep 只推进虚拟时钟，测试结果与机器负载无关"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limit_module, "time", fake)
+    monkeypatch.setattr(rate_limit_module._LocalBucket, "clock", staticmethod(fake.monotonic))
+    monkeypatch.setattr(rate_limit_module._SharedFile, "clock", staticmethod(fake.time))
+    return fake
+
+
+def test_token_bucket_blocking_and_reject(fake_time):
+    @rate_limit(rate=100, burst=5)
+    def call():
+        pass
+
+    for _ in range(25):
+        call()
+    # 5 个突发令牌 + 20 个按 100/s 补充，每次等待 10ms
+    assert sum(fake_time.slept) == pytest.approx(0.2)
+    assert call.limiter.stats()["waited"] == 20
+
+    limiter = RateLimiter(rate=1, burst=1, blocking=False)
+    limiter.acquire()
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire()
+    assert limiter.stats()["rejected"] == 1
+
+    limiter = RateLimiter(rate=1, burst=1, timeout=0.05)
+    limiter.acquire()
+    slept = len(fake_time.slept)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire()  # 需要约 1s，超过 timeout，立即拒绝
+    assert len(fake_time.slept) == slept
+
+
+def test_concurrency_limit_threads_and_async():
+    limiter = RateLimiter(max_concurrent=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    @limiter
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.005)
+        with lock:
+            active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+    @limiter
+    async def awork():
+        await asyncio.sleep(0.005)
+
+    async def main():
+        await asyncio.gather(*(awork() for _ in range(6)))
+
+    asyncio.run(main())
+    assert limiter.stats()["admitted"] == 14
+
+
+def _shared_burst(path):
+    limiter = RateLimiter(rate=1, burst=10, blocking=False, shared_path=path)
+    admitted = 0
+    for _ in range(10):
+        try:
+            limiter.acquire()
+            admitted += 1
+        except RateLimitExceeded:
+            pass
+    return admitted
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared_path 依赖 fcntl")
+def test_shared_bucket_across_processes(tmp_path):
+    path = str(tmp_path / "bucket")
+    RateLimiter(rate=1, burst=10, shared_path=path)  # 初始化共享状态
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        admitted = sum(executor.map(_shared_burst, [path] * 3))
+    # 三个进程共享 10 个令牌的突发；补充很慢（1/s），进程启动较慢时也只多出少量令牌
+    assert 10 <= admitted < 20
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared_path 依赖 fcntl")
+def test_shared_state_with_future_timestamp(tmp_path, fake_time):
+    from decorators.rate_limit import _STATE
+
+    # 状态由另一次启动/另一容器写入，时间戳在未来：不能算出巨大的等待
+    path = tmp_path / "bucket"
+    path.write_bytes(_STATE.pack(1.0, fake_time.time() + 86400))
+    limiter = RateLimiter(rate=100, burst=1, timeout=1.0, shared_path=str(path))
+    for _ in range(3):
+        limiter.acquire()
+    # 首个令牌来自已有状态，之后两次各按 100/s 等待 10ms
+    assert sum(fake_time.slept) == pytest.approx(0.02)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared_path 依赖 fcntl")
+def test_shared_slots_across_limiters_in_one_process(tmp_path):
+    path = str(tmp_path / "bucket")
+    first = RateLimiter(max_concurrent=1, blocking=False, shared_path=path)
+    second = RateLimiter(rate=1, burst=1, max_concurrent=1, blocking=False, shared_path=path)
+    first.acquire()
+    # 记录锁按进程归属：第二个限流器不能再“获得”同一个槽；失败时归还令牌
+    with pytest.raises(RateLimitExceeded):
+        second.acquire()
+    first.release()
+    second.acquire()
+    second.release()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared_path 依赖 fcntl")
+def test_shared_slots_released_by_owner(tmp_path):
+    path = str(tmp_path / "bucket")
+    narrow = RateLimiter(max_concurrent=1, blocking=False, shared_path=path)
+    wide = RateLimiter(max_concurrent=4, blocking=False, shared_path=path)
+    probe = RateLimiter(max_concurrent=1, blocking=False, shared_path=path)
+    narrow.acquire()  # 槽 0
+    for _ in range(3):
+        wide.acquire()  # 槽 1..3
+    # wide 只能释放自己的槽，槽 0 仍由 narrow 持有
+    wide.release()
+    wide.release()
+    with pytest.raises(RateLimitExceeded):
+        probe.acquire()
+    narrow.release()
+    probe.acquire()
+    probe.release()
+    wide.release()
+    narrow.acquire()
+    narrow.release()
+
+
+def test_auth_client_rate_limiter():
+    from core.auth_client import AuthClient, AuthContext, require_auth
+    from core.auth_transport import InProcessTransport
+
+    limiter = RateLimiter(rate=1, burst=2, blocking=False)
+    client = AuthClient(transport=InProcessTransport(lambda path: True), rate_limiter=limiter)
+    assert client.is_authorized("/api/x") and client.is_authorized("/api/x")
+    # 限流不是授权拒绝：RateLimitExceeded 原样抛出
+    with pytest.raises(RateLimitExceeded):
+        client.is_authorized("/api/x")
+    assert client.get_service_info()["rate_limit"]["rejected"] == 1
+
+    @require_auth(client, "/api/x")
+    def guarded():
+        return "ok"
+
+    with pytest.raises(RateLimitExceeded):
+        guarded()
+    with pytest.raises(RateLimitExceeded):
+        with AuthContext(client, "/api/x"):
+            pass
+
+
+def test_auth_client_rate_limiter_from_other_import_path():
+    import importlib
+    from core.auth_client import AuthClient
+    from core.auth_transport import InProcessTransport
+
+    # 以 src.decorators 导入的限流器抛出的是另一个 RateLimitExceeded 类，仍不能被当作“未授权”
+    other = importlib.import_module("src.decorators.rate_limit")
+    limiter = other.RateLimiter(rate=1, burst=1, blocking=False)
+    client = AuthClient(transport=InProcessTransport(lambda path: True), rate_limiter=limiter)
+    assert client.is_authorized("/api/x")
+    with pytest.raises(other.RateLimitExceeded) as info:
+        client.is_authorized("/api/x")
+    assert info.value.rate_limited
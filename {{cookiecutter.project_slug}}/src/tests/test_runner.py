@@ -0,0 +1,50 @@
+import io
+import os
+import sys
+import json
+
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # 工作进程按 'api.api:process_item' 顶层导入
+
+from src.api.runner import read_items, run_jobs
+
+
+def test_read_items_sources(tmp_path):
+    (tmp_path / "d" / "sub").mkdir(parents=True)
+    (tmp_path / "d" / "a.txt").write_text("a")
+    (tmp_path / "d" / "sub" / "b.txt").write_text("b")
+    assert sorted(os.path.basename(i["path"]) for i in read_items(str(tmp_path / "d"))) == ["a.txt", "b.txt"]
+
+    jsonl = tmp_path / "items.jsonl"
+    jsonl.write_text('{"i": 1}\n\n{"i": 2}\n')
+    assert list(read_items(str(jsonl))) == [{"i": 1}, {"i": 2}]
+
+    paths = tmp_path / "paths.txt"
+    paths.write_text("/x/a\n{\"i\": 3}\n")
+    assert list(read_items(str(paths))) == [{"path": "/x/a"}, {"i": 3}]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_run_jobs_output_errors_and_stats(ordered):
+    items = [{"i": i} if i % 10 else {"path": f"/nonexistent/{i}"} for i in range(200)]
+    output = io.StringIO()
+    stats = run_jobs(items, output, workers=2, chunk_size=7, ordered=ordered, auth=None)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats["items"] == len(lines) == 200
+    assert stats["errors"] == 20 and stats["workers"] == 2 and stats["items_per_s"] > 0
+    errors = [line for line in lines if "error" in line]
+    assert len(errors) == 20 and all(e["error"].startswith("FileNotFoundError") for e in errors)
+    results = [line["i"] for line in lines if "error" not in line]
+    expected = [i for i in range(200) if i % 10]
+    assert results == expected if ordered else sorted(results) == expected
+
+
+def test_run_jobs_unauthorized_stops_without_draining():
+    output = io.StringIO()
+    # builtins:bool 作为授权函数：bool() 为 False，每个工作进程都拒绝执行
+    with pytest.raises(PermissionError):
+        run_jobs(({"i": i} for i in range(100_000)), output, workers=2, chunk_size=1, auth="builtins:bool")
+    assert output.getvalue() == ""
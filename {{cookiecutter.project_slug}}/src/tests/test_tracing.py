@@ -0,0 +1,99 @@
+import os
+import sys
+import asyncio
+import threading
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)  # 与装饰器使用同一个 utils.tracing 模块
+
+from utils import tracing
+
+
+def setup_function():
+    tracing.clear()
+    tracing.enable()
+
+
+def teardown_function():
+    tracing.disable()
+    tracing.clear()
+
+
+def test_nested_spans_threads_and_asyncio():
+    @tracing.traced()
+    async def task(n):
+        with tracing.span("inner", n=n):
+            await asyncio.sleep(0.001)
+
+    async def gather():
+        await asyncio.gather(task(1), task(2))
+
+    def in_thread():
+        with tracing.span("in_thread"):
+            pass
+
+    with tracing.span("root") as root:
+        asyncio.run(gather())
+        worker = threading.Thread(target=tracing.wrap(in_thread))
+        worker.start()
+        worker.join()
+        with tracing.span("sync"):
+            pass
+
+    (only_root,) = tracing.roots()
+    assert only_root is root
+    names = sorted(child.name for child in root.children)
+    assert names == ["in_thread", "sync", "test_nested_spans_threads_and_asyncio.<locals>.task",
+                     "test_nested_spans_threads_and_asyncio.<locals>.task"]
+    assert all(s.trace_id == root.trace_id for s in root.children)
+    assert root.total >= root.self_time >= 0
+
+    events = tracing.to_chrome_trace()["traceEvents"]
+    assert len(events) == 7 and all(e["ph"] == "X" for e in events)
+    assert "inner" in tracing.format_tree()
+
+
+def test_disabled_is_noop():
+    tracing.disable()
+    with tracing.span("ignored") as s:
+        s.set(x=1)
+    assert tracing.roots() == []
+
+
+def test_stacked_decorators_share_one_span():
+    from decorators import timer, log_func_call
+
+    @timer(unit="ms")
+    @log_func_call()
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(3) == 2
+    (root,) = tracing.roots()
+    # 每次调用一个 span（两个装饰器共用）；函数体内的递归调用仍是子 span
+    assert root.name.endswith("fib") and [c.name for c in root.children] == [root.name] * 2
+    assert sum(1 for e in tracing.to_chrome_trace()["traceEvents"]) == 5  # fib(3) 共 5 次调用
+
+
+def test_children_finishing_after_parent_are_kept():
+    started, release = threading.Event(), threading.Event()
+
+    def background():
+        with tracing.span("late"):
+            started.set()
+            release.wait()
+
+    with tracing.span("parent") as parent:
+        worker = threading.Thread(target=tracing.wrap(background))
+        worker.start()
+        started.wait()
+
+    # 父 span 已结束、子 span 仍在运行：导出中可见并标记 unfinished
+    (late,) = parent.children
+    events = {e["name"]: e for e in tracing.to_chrome_trace()["traceEvents"]}
+    assert events["late"]["args"]["unfinished"] and "late" in tracing.format_tree()
+
+    release.set()
+    worker.join()
+    assert late.finished and late.attrs["after_parent"] and late.total > 0
+    assert "unfinished" not in tracing.to_chrome_trace()["traceEvents"][1]["args"]
@@ -0,0 +1,18 @@
+# helpers.pxd
+# Augmenting declarations for helpers.py: only used when compiled by Cython,
+# the pure-Python module is unaffected. 仅在 Cython 编译时生效的类型声明
+# 只为内部热点函数声明 C 类型；公开函数保持 object 签名，编译版与纯 Python 版行为一致
+# （C 类型签名会把 int/Decimal/Fraction 强转为 float、对 str 子类以外的输入抛出 TypeError）
+cimport cython
+
+# 批量姓名转换：_names_to_en 的逐名循环以 C 调用 _name_to_en，不经过 Python 调用协议
+cpdef str _name_to_en(str chinese_name)
+cpdef list _names_to_en(list names)
+
+# 目录遍历：每个目录一次调用，标志位为 C 布尔值，glob 匹配以 C 调用 _match_any
+cpdef bint _match_any(str rel_path, tuple patterns)
+
+@cython.locals(need_stat=bint)
+cpdef tuple _scan_dir(str root, str rel_dir, tuple includes, tuple excludes, tuple suffixes,
+                      object min_size, object max_size, object mtime_after, object mtime_before,
+                      bint follow_symlinks)
@@ -1,20 +1,63 @@
+# cython: binding=True
 import os
+import ntpath
 import shutil
+import stat
+import struct
 import zipfile
+import zlib
 import base64
+import csv
+import fnmatch
+import importlib
+from collections import deque
 from datetime import datetime
-from pypinyin import pinyin, Style
-from typing import Any, Iterable, Callable
-from typing_extensions import Annotated  # Python <3.10 使用 typing_extensions
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
-from config import *
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Annotated, Iterable, Iterator, Callable
 
-try:
-    import pyzipper  # 可选 AES 加密
-except ImportError:
-    pyzipper = None
+# --------------------
+# 延迟导入
+# --------------------
+# pypinyin（大词典）、Crypto、pyzipper 与 config（配置日志并打开日志文件）只在首次使用时加载，
+# 只用到 ensure_dir / current_time_str 等轻量函数的短命令不再为它们付出启动时间。
+# 旧代码通过 helpers.pinyin / helpers.AES 等访问的名字由模块级 __getattr__ 按需解析。
+_LAZY_ATTRS = {
+    "pinyin": ("pypinyin", "pinyin"),
+    "Style": ("pypinyin", "Style"),
+    "AES": ("Crypto.Cipher", "AES"),
+    "pad": ("Crypto.Util.Padding", "pad"),
+    "unpad": ("Crypto.Util.Padding", "unpad"),
+    "get_random_bytes": ("Crypto.Random", "get_random_bytes"),
+    "logger": ("config", "logger"),
+    "AES_KEY": ("config", "AES_KEY"),
+}
+
+_MISSING = object()
+_pyzipper = _MISSING
+
+
+def _optional_pyzipper():
+    """Import pyzipper on first use, None if not installed. 首次使用时导入 pyzipper（可选 AES 加密），未安装返回 None"""
+    global _pyzipper
+    if _pyzipper is _MISSING:
+        try:
+            import pyzipper
+        except ImportError:
+            pyzipper = None
+        _pyzipper = pyzipper
+    return _pyzipper
+
+
+def __getattr__(name: str) -> Any:
+    if name == "pyzipper":
+        return _optional_pyzipper()
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # --------------------
@@ -41,6 +84,11 @@ def aes_encrypt_file(
     Encrypt file using AES-CBC.
     使用 AES-CBC 加密文件
     """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    from Crypto.Random import get_random_bytes
+    from config import AES_KEY
+
     # 读取原始文件
     with open(input_path, "rb") as f:
         plaintext = f.read()
@@ -67,6 +115,10 @@ def aes_decrypt_file(
     Decrypt AES-CBC encrypted file.
     解密 AES-CBC 加密的文件
     """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+    from config import AES_KEY
+
     with open(input_path, "rb") as f:
         encrypted_data = f.read()
 
@@ -90,6 +142,11 @@ def aes_encrypt_bytes(
     Encrypt raw bytes with AES-CBC.
     使用 AES-CBC 加密字节数据
     """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    from Crypto.Random import get_random_bytes
+    from config import AES_KEY
+
     iv = get_random_bytes(16)
     cipher = AES.new(AES_KEY, AES.MODE_CBC, iv)
     ciphertext = cipher.encrypt(pad(data, AES.block_size))
@@ -106,6 +163,10 @@ def aes_decrypt_bytes(
     Decrypt AES-CBC encrypted bytes.
     解密 AES-CBC 加密的字节数据
     """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+    from config import AES_KEY
+
     iv = encrypted[:16]
     ciphertext = encrypted[16:]
     cipher = AES.new(AES_KEY, AES.MODE_CBC, iv)
@@ -114,30 +175,121 @@ def aes_decrypt_bytes(
 # --------------------
 # 名字转换
 # --------------------
+DOUBLE_SURNAMES = frozenset({
+    "欧阳", "太史", "端木", "上官", "司马", "东方", "独孤", "南宫",
+    "万俟", "闻人", "夏侯", "诸葛", "尉迟", "公羊", "赫连", "皇甫",
+    "宗政", "濮阳", "公冶", "太叔", "申屠", "公孙", "慕容", "仲孙",
+    "钟离", "长孙", "宇文", "城池", "司徒", "司空", "亓官", "鲜于",
+    "闾丘", "子车", "颛孙", "巫马", "公西", "漆雕", "乐正"
+})
+
+# 单字拼音缓存上限：常用汉字约 2 万，足以覆盖人名用字
+PINYIN_CACHE_SIZE = 32768
+
+
+@lru_cache(maxsize=PINYIN_CACHE_SIZE)
+def _char_pinyin(char: str) -> str:
+    """Cached pinyin of a single character. 单字拼音（带缓存）"""
+    from pypinyin import pinyin, Style
+    return pinyin(char, style=Style.NORMAL)[0][0]
+
+
+def _name_to_en(chinese_name: str) -> str:
+    """Convert one name using the hoisted surname table and the char cache. 使用复姓表与单字缓存转换单个名字"""
+    # 检查是否复姓
+    split = 2 if len(chinese_name) >= 2 and chinese_name[:2] in DOUBLE_SURNAMES else 1
+    surname_pinyin = ''.join([_char_pinyin(c) for c in chinese_name[:split]])
+    given_name_pinyin = ''.join([_char_pinyin(c) for c in chinese_name[split:]])
+    # 组合成英文名
+    return f"{given_name_pinyin}.{surname_pinyin}".lower()
+
+
+def _names_to_en(names: list[str]) -> list[str]:
+    """Convert a chunk of names, used as the process pool task. 批量转换一块名字（进程池任务）"""
+    result = []
+    for name in names:  # 显式循环：编译后按 helpers.pxd 的声明直接以 C 调用 _name_to_en
+        name = name.strip()
+        result.append(_name_to_en(name) if name else "")
+    return result
+
+
 def fullname_cn2en(
         chinese_name: Annotated[str, ParamInfo("Chinese full name / 中文全名")]
 ) -> str:
     """Convert Chinese full name to English-style 'given.surname'. 中文名转英文名"""
-    double_surname = {
-        "欧阳", "太史", "端木", "上官", "司马", "东方", "独孤", "南宫",
-        "万俟", "闻人", "夏侯", "诸葛", "尉迟", "公羊", "赫连", "皇甫",
-        "宗政", "濮阳", "公冶", "太叔", "申屠", "公孙", "慕容", "仲孙",
-        "钟离", "长孙", "宇文", "城池", "司徒", "司空", "亓官", "鲜于",
-        "闾丘", "子车", "颛孙", "端木", "巫马", "公西", "漆雕", "乐正"
-    }
-    # 检查是否复姓
-    if len(chinese_name) >= 2 and chinese_name[:2] in double_surname:
-        surname = chinese_name[:2]
-        given_name = chinese_name[2:]
-    else:
-        surname = chinese_name[0]
-        given_name = chinese_name[1:]
-    # 获取拼音
-    surname_pinyin = pinyin(surname, style=Style.NORMAL)[0][0]
-    given_name_pinyin = ''.join([p[0] for p in pinyin(given_name, style=Style.NORMAL)])
-    # 组合成英文名
-    english_name = f"{given_name_pinyin}.{surname_pinyin}"
-    return english_name.lower()
+    return _name_to_en(chinese_name)
+
+
+def fullname_cn2en_batch(
+        names: Annotated[Iterable[str], ParamInfo("Iterable of Chinese full names / 中文全名序列")],
+        workers: Annotated[int, ParamInfo("Worker processes, 1 means in-process / 进程数，1 表示当前进程")] = 1,
+        chunk_size: Annotated[int, ParamInfo("Names per task sent to a worker / 每个任务的名字数量")] = 10000
+) -> Iterator[str]:
+    """
+    Convert names lazily, preserving input order; empty names yield ''.
+    惰性批量转换，保持输入顺序；空名字输出 ''
+
+    Input is consumed chunk by chunk, so at most about 2 * workers chunks are held in memory.
+    输入按块消费，内存中最多约 2 * workers 个块
+    """
+    it = iter(names)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _names_to_en(chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_names_to_en, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def fullname_cn2en_csv(
+        input_path: Annotated[str, ParamInfo("Input CSV file path / 输入 CSV 文件路径")],
+        output_path: Annotated[str, ParamInfo("Output CSV file path / 输出 CSV 文件路径")],
+        column: Annotated[str, ParamInfo("Column holding Chinese names / 中文名所在列")],
+        out_column: Annotated[str, ParamInfo("Column to write English names / 英文名输出列")] = "english_name",
+        workers: Annotated[int, ParamInfo("Worker processes / 进程数")] = 1,
+        encoding: Annotated[str, ParamInfo("File encoding / 文件编码")] = "utf-8"
+) -> int:
+    """
+    Stream a CSV file, append the converted name column, return row count.
+    流式读取 CSV，追加英文名列，返回处理行数
+    """
+    count = 0
+    with open(input_path, "r", encoding=encoding, newline="") as fin, \
+            open(output_path, "w", encoding=encoding, newline="") as fout:
+        reader = csv.DictReader(fin)
+        if reader.fieldnames is None or column not in reader.fieldnames:
+            raise ValueError(f"Column '{column}' not found in {input_path}")
+        fieldnames = list(reader.fieldnames)
+        if out_column not in fieldnames:
+            fieldnames.append(out_column)
+        writer = csv.DictWriter(fout, fieldnames=fieldnames)
+        writer.writeheader()
+
+        # 行缓冲与名字转换同步推进：转换结果按输入顺序返回
+        rows = deque()
+
+        def _names():
+            for row in reader:
+                rows.append(row)
+                yield row[column] or ""
+
+        for english_name in fullname_cn2en_batch(_names(), workers=workers):
+            row = rows.popleft()
+            row[out_column] = english_name
+            writer.writerow(row)
+            count += 1
+    return count
 
 
 # --------------------
@@ -149,10 +301,167 @@ def ensure_dir(path: Annotated[str, ParamInfo("Directory path to ensure / 待确
     return path
 
 
-def remove_dir(path: Annotated[str, ParamInfo("Directory path to remove / 待删除的目录路径")]) -> None:
+def _unlink_entries(path: str) -> list[str]:
+    """Unlink every non-directory entry in path, return sub directories. 删除目录下所有非目录条目，返回子目录"""
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                os.unlink(entry.path)  # 文件与符号链接（含指向目录的链接）直接删除
+    return subdirs
+
+
+def remove_dir(
+        path: Annotated[str, ParamInfo("Directory path to remove / 待删除的目录路径")],
+        workers: Annotated[int, ParamInfo("Threads used to unlink entries, 1 means shutil.rmtree / 删除线程数，1 表示 shutil.rmtree")] = 1
+) -> None:
     """Remove directory and all its contents. 删除目录及其所有内容"""
-    if os.path.exists(path):
+    if not os.path.exists(path):
+        return
+    if workers <= 1 or os.path.islink(path):
         shutil.rmtree(path)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    # 阶段一：按目录并行删除文件，同时记录目录深度
+    levels: dict[int, list[str]] = {0: [path]}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(_unlink_entries, path): 0}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = running.pop(future) + 1
+                for subdir in future.result():
+                    levels.setdefault(depth, []).append(subdir)
+                    running[executor.submit(_unlink_entries, subdir)] = depth
+
+        # 阶段二：自底向上逐层并行删除空目录
+        for depth in sorted(levels, reverse=True):
+            for future in [executor.submit(os.rmdir, d) for d in levels[depth]]:
+                future.result()
+
+
+def _copy_file_data(src: str, dst: str, buffer_size: int = 1024 * 1024) -> None:
+    """
+    Copy file content, preferring kernel-side copies.
+    复制文件内容：优先 copy_file_range（可利用 reflink/服务端复制），其次 sendfile，最后缓冲读写
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(infd).st_size
+        offset = 0
+
+        for kernel_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if kernel_copy is None:
+                continue
+            try:
+                while offset < size:
+                    if kernel_copy is os.sendfile:
+                        sent = os.sendfile(outfd, infd, offset, size - offset)
+                    else:
+                        sent = os.copy_file_range(infd, outfd, size - offset, offset, offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except OSError:
+                # 跨文件系统 / 内核不支持时回退到下一种方式，从已复制位置继续
+                pass
+
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        shutil.copyfileobj(fsrc, fdst, buffer_size)
+
+
+def _copy_one(src: str, dst: str, skip_unchanged: bool, follow_symlinks: bool) -> bool:
+    """Copy a single file (or symlink), return False if skipped. 复制单个文件（或符号链接），跳过时返回 False"""
+    try:
+        dst_st = os.lstat(dst)  # 不跟随目标处已有的符号链接
+    except FileNotFoundError:
+        dst_st = None
+    if dst_st is not None and stat.S_ISDIR(dst_st.st_mode):
+        raise IsADirectoryError(f"Cannot replace directory with a file / 目标已是目录，无法复制文件: {dst} <- {src}")
+
+    if not follow_symlinks and os.path.islink(src):
+        target = os.readlink(src)
+        if dst_st is not None:
+            if skip_unchanged and stat.S_ISLNK(dst_st.st_mode) and os.readlink(dst) == target:
+                return False
+            os.unlink(dst)
+        os.symlink(target, dst)
+        return True
+
+    if dst_st is not None:
+        if skip_unchanged and stat.S_ISREG(dst_st.st_mode):
+            src_st = os.stat(src)
+            # copystat 按纳秒保留 mtime；按秒比较会漏掉同一秒内改写且大小不变的文件
+            if src_st.st_size == dst_st.st_size and src_st.st_mtime_ns == dst_st.st_mtime_ns:
+                return False
+        # 先删除再新建：目标若是符号链接（或硬链接），open(..., "wb") 会写到树外（或改动其他链接）
+        os.unlink(dst)
+
+    _copy_file_data(src, dst)
+    shutil.copystat(src, dst)  # 保留 mtime，供下次增量比较
+    return True
+
+
+def copy_tree(
+        src: Annotated[str, ParamInfo("Source directory / 源目录")],
+        dst: Annotated[str, ParamInfo("Destination directory / 目标目录")],
+        workers: Annotated[int, ParamInfo("Concurrent file copies / 并发复制文件数")] = 8,
+        skip_unchanged: Annotated[bool, ParamInfo("Skip files with same size and mtime / 跳过大小与修改时间相同的文件")] = True,
+        follow_symlinks: Annotated[bool, ParamInfo("Copy link targets instead of links / 复制链接目标而非链接本身")] = False
+) -> tuple[int, int]:
+    """
+    Copy a directory tree concurrently, return (copied, skipped) file counts.
+    并发复制目录树，返回（复制数, 跳过数）
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    src, dst = os.path.abspath(src), os.path.abspath(dst)
+    copied = skipped = 0
+    max_pending = max(workers, 1) * 4  # 有界提交，避免百万文件时堆积 future
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        pending = set()
+        copied_dirs = []
+
+        def _drain(limit: int) -> None:
+            nonlocal pending, copied, skipped
+            while len(pending) > limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        copied += 1
+                    else:
+                        skipped += 1
+
+        for root, dirs, files in os.walk(src, followlinks=follow_symlinks):
+            target_root = os.path.join(dst, os.path.relpath(root, src))
+            if os.path.islink(target_root):
+                os.unlink(target_root)  # 目标中同名的目录符号链接会把文件写到树外
+            os.makedirs(target_root, exist_ok=True)
+            if not follow_symlinks:
+                # 指向目录的符号链接按链接复制，不递归进入
+                links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+                dirs[:] = [d for d in dirs if d not in links]
+                files = files + links
+            for name in files:
+                pending.add(executor.submit(_copy_one, os.path.join(root, name), os.path.join(target_root, name),
+                                            skip_unchanged, follow_symlinks))
+                _drain(max_pending)
+            copied_dirs.append((root, target_root))
+
+        _drain(0)
+
+    # 目录属性最后复制，避免写入文件后 mtime 被改动
+    for root, target_root in reversed(copied_dirs):
+        shutil.copystat(root, target_root)
+    return copied, skipped
 
 
 def list_files(
@@ -160,8 +469,163 @@ def list_files(
         suffix: Annotated[str, ParamInfo("Optional suffix filter / 可选后缀过滤")] = ""
 ) -> list[str]:
     """List files in a directory with optional suffix filter. 列出目录下的文件，可按后缀过滤"""
-    return [f for f in os.listdir(path)
-            if os.path.isfile(os.path.join(path, f)) and f.endswith(suffix)]
+    # scandir 复用 DirEntry 缓存的类型信息，避免每个条目额外一次 stat
+    with os.scandir(path) as it:
+        return [entry.name for entry in it
+                if entry.is_file() and entry.name.endswith(suffix)]
+
+
+def _match_any(rel_path: str, patterns: tuple) -> bool:
+    """Whether rel_path matches any glob pattern. 相对路径是否匹配任一 glob 模式"""
+    for pattern in patterns:
+        if fnmatch.fnmatch(rel_path, pattern):
+            return True
+    return False
+
+
+def _scan_dir(
+        root: str,
+        rel_dir: str,
+        includes: tuple,
+        excludes: tuple,
+        suffixes: tuple,
+        min_size: int | None,
+        max_size: int | None,
+        mtime_after: float | None,
+        mtime_before: float | None,
+        follow_symlinks: bool
+) -> tuple[list[str], list[tuple[str, tuple | None]]]:
+    """
+    Scan one directory, return (matched files, [(sub directory, (st_dev, st_ino) or None)]).
+    扫描单个目录，返回（匹配文件, 子目录及其设备号/inode）；仅跟随符号链接时才取 inode 用于检测环
+    """
+    files, subdirs = [], []
+    need_stat = min_size is not None or max_size is not None or mtime_after is not None or mtime_before is not None
+
+    try:
+        it = os.scandir(os.path.join(root, rel_dir) if rel_dir else root)
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return files, subdirs
+
+    with it:
+        for entry in it:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if not (excludes and _match_any(rel_path, excludes)):
+                        if follow_symlinks:
+                            st = entry.stat()
+                            subdirs.append((rel_path, (st.st_dev, st.st_ino)))
+                        else:
+                            subdirs.append((rel_path, None))
+                    continue
+                # 与 os.walk 一致：不跟随链接时，指向文件的符号链接仍作为文件产出
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if suffixes and not entry.name.endswith(suffixes):
+                continue
+            if includes and not _match_any(rel_path, includes):
+                continue
+            if excludes and _match_any(rel_path, excludes):
+                continue
+
+            if need_stat:
+                try:
+                    st = entry.stat()  # Windows 下为缓存值，无额外系统调用
+                except OSError:
+                    continue
+                if min_size is not None and st.st_size < min_size:
+                    continue
+                if max_size is not None and st.st_size > max_size:
+                    continue
+                if mtime_after is not None and st.st_mtime < mtime_after:
+                    continue
+                if mtime_before is not None and st.st_mtime > mtime_before:
+                    continue
+
+            files.append(rel_path)
+
+    return files, subdirs
+
+
+def iter_files(
+        path: Annotated[str, ParamInfo("Root directory path / 根目录路径")],
+        recursive: Annotated[bool, ParamInfo("Recurse into sub directories / 是否递归子目录")] = True,
+        include: Annotated[Iterable[str] | None, ParamInfo("Glob patterns to include, matched on relative path / 包含的 glob 模式（匹配相对路径）")] = None,
+        exclude: Annotated[Iterable[str] | None, ParamInfo("Glob patterns to exclude, also prunes directories / 排除的 glob 模式（同时裁剪目录）")] = None,
+        suffixes: Annotated[Iterable[str] | None, ParamInfo("Allowed file suffixes / 允许的文件后缀集合")] = None,
+        min_size: Annotated[int | None, ParamInfo("Minimum file size in bytes / 最小文件字节数")] = None,
+        max_size: Annotated[int | None, ParamInfo("Maximum file size in bytes / 最大文件字节数")] = None,
+        mtime_after: Annotated[float | None, ParamInfo("Only files modified after this timestamp / 仅保留此时间戳之后修改的文件")] = None,
+        mtime_before: Annotated[float | None, ParamInfo("Only files modified before this timestamp / 仅保留此时间戳之前修改的文件")] = None,
+        workers: Annotated[int, ParamInfo("Threads used to traverse directories, 1 means serial / 遍历线程数，1 表示串行")] = 1,
+        follow_symlinks: Annotated[bool, ParamInfo("Follow symbolic links / 是否跟随符号链接")] = False,
+        absolute: Annotated[bool, ParamInfo("Yield absolute paths instead of relative / 返回绝对路径而非相对路径")] = False
+) -> Iterator[str]:
+    """
+    Lazily walk a directory tree with os.scandir and yield matching files.
+    基于 os.scandir 的惰性遍历，逐个产出匹配的文件路径
+
+    Relative paths always use '/' as separator; with workers > 1 the yield order is not deterministic.
+    With follow_symlinks each directory (by st_dev/st_ino) is visited once, so symlink loops terminate.
+    相对路径统一使用 '/' 分隔；workers > 1 时产出顺序不固定；跟随符号链接时每个目录只遍历一次，链接成环也会结束
+    """
+    root = os.path.abspath(path)
+    options = (
+        tuple(include or ()),
+        tuple(exclude or ()),
+        tuple(suffixes or ()),
+        min_size, max_size, mtime_after, mtime_before, follow_symlinks,
+    )
+
+    visited = set()
+    if follow_symlinks:
+        try:
+            st = os.stat(root)
+            visited.add((st.st_dev, st.st_ino))
+        except OSError:
+            pass
+
+    def _emit(rel_path: str) -> str:
+        return os.path.join(root, rel_path) if absolute else rel_path
+
+    def _unvisited(subdirs: list) -> list[str]:
+        result = []
+        for rel_dir, key in subdirs:
+            if key is not None:
+                if key in visited:
+                    continue  # 符号链接成环或重复指向同一目录
+                visited.add(key)
+            result.append(rel_dir)
+        return result
+
+    if workers <= 1:
+        pending = [""]
+        while pending:
+            files, subdirs = _scan_dir(root, pending.pop(), *options)
+            for rel_path in files:
+                yield _emit(rel_path)
+            if recursive:
+                # 逆序压栈，保持与目录内顺序一致的深度优先遍历
+                pending.extend(reversed(_unvisited(subdirs)))
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    # 宽目录树：每个目录作为一个任务提交到线程池，scandir 期间释放 GIL
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(_scan_dir, root, "", *options)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                if recursive:
+                    running.update(executor.submit(_scan_dir, root, d, *options) for d in _unvisited(subdirs))
+                for rel_path in files:
+                    yield _emit(rel_path)
 
 
 # --------------------
@@ -245,7 +709,8 @@ def zip_dir(
     zip_path = os.path.abspath(zip_path)
 
     # AES 加密优先
-    if password and pyzipper:
+    pyzipper = _optional_pyzipper() if password else None
+    if pyzipper:
         with pyzipper.AESZipFile(zip_path, 'w', compression=pyzipper.ZIP_DEFLATED,
                                  encryption=pyzipper.WZ_AES) as zf:
             zf.setpassword(password.encode())
@@ -275,7 +740,8 @@ def unzip_file(
     extract_dir = os.path.abspath(extract_dir)
     ensure_dir(extract_dir)
 
-    if password and pyzipper:
+    pyzipper = _optional_pyzipper() if password else None
+    if pyzipper:
         with pyzipper.AESZipFile(zip_path, 'r') as zf:
             zf.setpassword(password.encode())
             zf.extractall(extract_dir)
@@ -304,6 +770,255 @@ def make_archive(
     return zip_path
 
 
+# --------------------
+# 流式压缩 + 加密
+# --------------------
+# 文件格式与 aes_encrypt_file(make_archive(...)) 相同：IV(16) + AES-CBC(PKCS7(zip))，
+# 解密后是标准 zip（条目带数据描述符），旧的 aes_decrypt_file + unzip_file 仍可处理。
+# 压缩、加密、写出在一次遍历中完成，内存占用与 buffer_size 成正比，不产生中间 zip 文件。
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+_ZIP_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+_ZIP_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+
+
+class _AESCBCWriter:
+    """Write-only file object: AES-CBC encrypts in block-aligned chunks. 按块对齐分段加密的只写文件对象"""
+
+    def __init__(self, raw, cipher, iv: bytes, buffer_size: int):
+        self._raw = raw
+        self._cipher = cipher
+        self._buffer_size = buffer_size
+        self._pending = bytearray()
+        raw.write(iv)
+
+    def write(self, data) -> int:
+        self._pending += data
+        if len(self._pending) >= self._buffer_size:
+            usable = len(self._pending) - len(self._pending) % 16
+            self._raw.write(self._cipher.encrypt(bytes(self._pending[:usable])))
+            del self._pending[:usable]
+        return len(data)
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def close(self, pad: Callable[[bytes, int], bytes]) -> None:
+        """加密剩余数据并写入 PKCS7 填充"""
+        self._raw.write(self._cipher.encrypt(pad(bytes(self._pending), 16)))
+        self._pending = bytearray()
+        self._raw.flush()
+
+
+class _AESCBCReader:
+    """Read-only file object over IV + AES-CBC ciphertext, unpadding at EOF. 分段解密的只读文件对象"""
+
+    def __init__(self, raw, cipher, unpad: Callable[[bytes, int], bytes], buffer_size: int):
+        self._raw = raw
+        self._cipher = cipher
+        self._unpad = unpad
+        self._buffer_size = buffer_size - buffer_size % 16 or 16
+        self._carry = b""      # 不足一个分组的密文
+        self._tail = b""       # 最后一个明文分组，到达 EOF 前不能确定是否含填充
+        self._buffer = b""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        data = self._raw.read(self._buffer_size)
+        if not data:
+            if self._carry or not self._tail:
+                raise ValueError("Truncated ciphertext / 密文长度不完整")
+            self._buffer, self._pos, self._tail, self._eof = self._unpad(self._tail, 16), 0, b"", True
+            return
+        data = self._carry + data
+        usable = len(data) - len(data) % 16
+        self._carry = data[usable:]
+        if not usable:
+            return
+        plain = self._tail + self._cipher.decrypt(data[:usable])
+        self._buffer, self._pos, self._tail = plain[:-16], 0, plain[-16:]
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self._buffer_size), b""))
+        while self._pos >= len(self._buffer) and not self._eof:
+            self._fill()
+        chunk = self._buffer[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+    def read_exact(self, size: int) -> bytes:
+        parts, remaining = [], size
+        while remaining:
+            chunk = self.read(remaining)
+            if not chunk:
+                raise zipfile.BadZipFile("Unexpected end of archive / 压缩包不完整")
+            parts.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(parts)
+
+    def unread(self, data: bytes) -> None:
+        """退回多读的数据（解压器越过条目末尾的部分）"""
+        if data:
+            self._buffer, self._pos = data + self._buffer[self._pos:], 0
+
+
+def _safe_member_path(extract_dir: str, name: str) -> str:
+    """
+    条目名转换为解压目录内的路径：与 zipfile.extract 一样去掉盘符 / UNC 前缀和开头的分隔符，
+    任何平台上都按 Windows 规则去盘符（C:/x -> x，C:..\\x 去盘符后含 '..' 被拒绝）；含 '..' 的条目直接拒绝
+    """
+    relative = ntpath.splitdrive(name.replace("\\", "/"))[1]
+    parts = [p for p in relative.split("/") if p not in ("", ".")]
+    if not parts or ".." in parts:
+        raise zipfile.BadZipFile(f"Unsafe member path / 非法条目路径: {name!r}")
+    return os.path.join(extract_dir, *parts)
+
+
+def _zip64_sizes(extra: bytes, csize: int, usize: int) -> tuple[int, int, bool]:
+    """解析本地头中的 zip64 扩展字段，返回 (压缩大小, 原始大小, 是否 zip64)"""
+    offset = 0
+    while offset + 4 <= len(extra):
+        tag, length = struct.unpack_from("<HH", extra, offset)
+        if tag == 0x0001:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, offset + 4))
+            if usize == 0xFFFFFFFF:
+                usize = next(values)
+            if csize == 0xFFFFFFFF:
+                csize = next(values)
+            return csize, usize, True
+        offset += 4 + length
+    return csize, usize, False
+
+
+def _extract_member(reader: _AESCBCReader, out, method: int, flags: int, csize: int, buffer_size: int) -> int:
+    """把一个条目的数据流式写入 out，返回 CRC32"""
+    crc = 0
+    if method == zipfile.ZIP_STORED:
+        if flags & 0x08:
+            raise zipfile.BadZipFile("Stored entries with data descriptor are not streamable / 不支持的条目格式")
+        remaining = csize
+        while remaining:
+            chunk = reader.read(min(remaining, buffer_size))
+            if not chunk:
+                raise zipfile.BadZipFile("Unexpected end of archive / 压缩包不完整")
+            crc = zlib.crc32(chunk, crc)
+            out.write(chunk)
+            remaining -= len(chunk)
+        return crc
+
+    if method != zipfile.ZIP_DEFLATED:
+        raise zipfile.BadZipFile(f"Unsupported compression method {method} / 不支持的压缩方式")
+    decompressor = zlib.decompressobj(-15)
+    remaining = None if flags & 0x08 else csize  # 带数据描述符时以 deflate 流结束为准
+    while not decompressor.eof:
+        chunk = reader.read(buffer_size if remaining is None else min(remaining, buffer_size))
+        if not chunk:
+            raise zipfile.BadZipFile("Unexpected end of archive / 压缩包不完整")
+        if remaining is not None:
+            remaining -= len(chunk)
+        data = decompressor.decompress(chunk, buffer_size)  # 限制单次输出，压缩比很高时内存仍有上界
+        while True:
+            crc = zlib.crc32(data, crc)
+            out.write(data)
+            if decompressor.eof or not decompressor.unconsumed_tail:
+                break  # 到达流末尾时，越过末尾的输入在 unused_data 中
+            data = decompressor.decompress(decompressor.unconsumed_tail, buffer_size)
+    reader.unread(decompressor.unused_data)
+    return crc
+
+
+def encrypt_archive(
+        folder_path: Annotated[str, ParamInfo("Folder to compress / 待压缩文件夹")],
+        output_path: Annotated[str, ParamInfo("Encrypted archive path / 加密压缩包输出路径")],
+        key: Annotated[bytes | None, ParamInfo("AES key, default config.AES_KEY / AES 密钥")] = None,
+        compresslevel: Annotated[int | None, ParamInfo("Deflate level 0-9 / 压缩级别")] = None,
+        buffer_size: Annotated[int, ParamInfo("Encryption chunk size in bytes / 加密分段大小")] = STREAM_BUFFER_SIZE
+) -> str:
+    """
+    Walk, compress and AES-CBC encrypt a folder in one pass, no temporary zip.
+    单次遍历完成压缩与加密，直接写出加密文件，不产生中间 zip
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    from Crypto.Random import get_random_bytes
+    if key is None:
+        from config import AES_KEY as key
+
+    folder_path = os.path.abspath(folder_path)
+    output_path = os.path.abspath(output_path)
+    iv = get_random_bytes(16)
+    with open(output_path, "wb") as raw:
+        writer = _AESCBCWriter(raw, AES.new(key, AES.MODE_CBC, iv), iv, buffer_size)
+        # writer 不支持 seek/tell，zipfile 自动切换为流式写出（条目后附数据描述符）
+        with zipfile.ZipFile(writer, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+            for root, _, files in os.walk(folder_path):
+                for file in files:
+                    path = os.path.join(root, file)
+                    if os.path.abspath(path) != output_path:
+                        zf.write(path, os.path.relpath(path, folder_path))
+        writer.close(pad)
+    return output_path
+
+
+def decrypt_extract(
+        input_path: Annotated[str, ParamInfo("Encrypted archive path / 加密压缩包路径")],
+        extract_dir: Annotated[str, ParamInfo("Directory to extract / 解压目录")],
+        key: Annotated[bytes | None, ParamInfo("AES key, default config.AES_KEY / AES 密钥")] = None,
+        buffer_size: Annotated[int, ParamInfo("Read chunk size in bytes / 读取分段大小")] = STREAM_BUFFER_SIZE
+) -> int:
+    """
+    Decrypt and extract in one pass by reading zip local headers sequentially; returns file count.
+    单次顺序读取完成解密与解压（按本地文件头逐条解析，无需中间文件与随机访问），返回文件数
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+    if key is None:
+        from config import AES_KEY as key
+
+    extract_dir = ensure_dir(os.path.abspath(extract_dir))
+    count = 0
+    with open(input_path, "rb") as raw:
+        iv = raw.read(16)
+        if len(iv) != 16:
+            raise ValueError("Truncated ciphertext / 密文长度不完整")
+        reader = _AESCBCReader(raw, AES.new(key, AES.MODE_CBC, iv), unpad, buffer_size)
+        while True:
+            signature = reader.read_exact(4)
+            if signature in _ZIP_END_SIGNATURES:
+                break  # 中央目录：所有条目已处理
+            if signature != _ZIP_LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile("Bad local file header / 本地文件头错误（密钥错误？）")
+            (_, _, flags, method, _, _, crc, csize, usize, name_len, extra_len) = _ZIP_LOCAL_HEADER.unpack(
+                signature + reader.read_exact(_ZIP_LOCAL_HEADER.size - 4))
+            if flags & 0x01:
+                raise zipfile.BadZipFile("Encrypted zip entries are not supported / 不支持加密的 zip 条目")
+            name = reader.read_exact(name_len).decode("utf-8" if flags & 0x800 else "cp437")
+            csize, usize, zip64 = _zip64_sizes(reader.read_exact(extra_len), csize, usize)
+
+            target = _safe_member_path(extract_dir, name)
+            if name.endswith("/"):
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as out:
+                actual_crc = _extract_member(reader, out, method, flags, csize, buffer_size)
+
+            if flags & 0x08:
+                descriptor = reader.read_exact(4)
+                if descriptor == _ZIP_DESCRIPTOR_SIGNATURE:
+                    descriptor = reader.read_exact(4)
+                crc = struct.unpack("<L", descriptor)[0]
+                reader.read_exact(16 if zip64 else 8)  # 压缩大小与原始大小
+            if actual_crc != crc:
+                raise zipfile.BadZipFile(f"CRC mismatch / 校验失败: {name}")
+            count += 1
+    return count
+
+
 # --------------------
 # 函数工具
 # --------------------
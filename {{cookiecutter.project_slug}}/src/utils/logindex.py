@@ -0,0 +1,380 @@
+"""
+File: logindex.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: JSON-lines log sink, per-file sidecar block index and indexed query over logs/*.log / *.jsonl.
+
+每个日志文件按约 BLOCK_SIZE 字节（按记录边界）切块，索引 <file>.idx 为每块记录：
+    字节范围、时间范围、出现的级别（位掩码）、标签（[CALL]/[TIMER]/[EXCEPTION]...）、函数名、最大耗时
+查询时只对可能命中的块做 mmap 切片读取与逐条过滤，其余块直接跳过。
+已轮转的文件不再变化，索引只建一次；正在写入的文件按追加内容增量更新索引。
+
+同时支持 config.py 的 JSON-lines 日志（LOG_JSONL=1 开启）与 loguru 默认格式的文本日志。
+"""
+import os
+import re
+import json
+import mmap
+import time
+import glob
+from datetime import datetime
+from typing import Any, Annotated, Iterable, Iterator, Optional
+
+from .helpers import ParamInfo
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+BLOCK_SIZE = 64 * 1024
+LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+_LEVEL_BITS = {name: 1 << i for i, name in enumerate(LEVELS)}
+
+# 装饰器输出的标签消息：[CALL] name ... / [TIMER] Function 'name' executed in 1.234 ms / [EXCEPTION] name ...
+_TAG_RE = re.compile(r"\[([A-Z_]+)\]\s+(?:Function\s+')?([\w.<>]+)")
+_DURATION_RE = re.compile(r"executed in ([\d.]+) (s|ms|us)\b")
+_UNIT_SECONDS = {"s": 1.0, "ms": 1e-3, "us": 1e-6}
+# loguru 默认文件格式：2026-01-01 12:00:00.123 | INFO     | module:function:line - message
+_TEXT_RE = re.compile(rb"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)\.(\d+) \| (\w+)\s*\| \S+ - ")
+
+
+def parse_message(message: str) -> tuple[Optional[str], Optional[str], Optional[float]]:
+    """Extract (tag, function name, duration seconds) from a decorator log message. 从日志消息解析标签/函数名/耗时"""
+    match = _TAG_RE.match(message)
+    if match is None:
+        return None, None, None
+    tag, func = match.groups()
+    duration = None
+    if tag == "TIMER":
+        timed = _DURATION_RE.search(message, match.end())
+        if timed:
+            duration = float(timed.group(1)) * _UNIT_SECONDS[timed.group(2)]
+    return tag, func, duration
+
+
+# --------------------
+# JSON-lines sink
+# --------------------
+def _jsonl_format(record: dict) -> str:
+    tag, func, duration = parse_message(record["message"])
+    entry = {
+        "ts": record["time"].timestamp(),
+        "level": record["level"].name,
+        "tag": tag,
+        "func": func,
+        "dur": duration,
+        "msg": record["message"],
+        "where": f"{record['name']}:{record['function']}:{record['line']}",
+    }
+    if record["exception"] is not None:
+        import traceback
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_jsonl"] = json.dumps(entry, ensure_ascii=False)
+    return "{extra[_jsonl]}\n"  # 模板只引用预先序列化的字段，消息中的花括号不会被再次格式化
+
+
+def add_jsonl_sink(
+        logger,
+        path: Annotated[str, ParamInfo("JSON-lines log file / JSON-lines 日志文件")],
+        **kwargs: Any
+) -> int:
+    """Add a JSON-lines file sink to a loguru logger; kwargs go to logger.add (rotation, retention...). 添加 JSON-lines 日志输出"""
+    return logger.add(path, format=_jsonl_format, encoding="utf-8", **kwargs)
+
+
+# --------------------
+# 记录解析
+# --------------------
+def is_jsonl(path: str) -> bool:
+    """JSON-lines log by file name, including rotated copies (app.2024-01-31_12-00-00_000000.jsonl). 是否为 JSON-lines 日志"""
+    return ".jsonl" in os.path.basename(path)
+
+
+def _parse_json(line: bytes) -> Optional[tuple]:
+    """JSON-lines 的一行 -> (ts, level, tag, func, duration, message)；无法识别的行返回 None"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "ts" not in entry or "level" not in entry:
+        return None
+    return entry["ts"], entry["level"], entry.get("tag"), entry.get("func"), entry.get("dur"), entry.get("msg", "")
+
+
+def _parse_text(line: bytes) -> Optional[tuple]:
+    """文本日志的一行 -> (ts, level, tag, func, duration, message)；续行（traceback、打印的 dict 等）返回 None"""
+    match = _TEXT_RE.match(line)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, frac, level = match.groups()
+    ts = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                  int(frac.ljust(6, b"0")[:6])).timestamp()
+    message = line[match.end():].decode("utf-8", "replace")
+    return (ts, level.decode(), *parse_message(message), message)
+
+
+def _iter_records(buf, start: int, end: int, jsonl: bool,
+                  needles: tuple[bytes, ...] = ()) -> Iterator[tuple[int, int, tuple]]:
+    """
+    遍历 [start, end) 内的记录，返回 (起始偏移, 结束偏移, 解析结果)；续行并入上一条记录
+    jsonl: 按文件类型选择解析器，不逐行猜测（文本日志中的 JSON 续行不会被当作记录）
+    needles: 首行必须包含的字节串，不包含的记录跳过解析（连同其续行）
+    """
+    parse = _parse_json if jsonl else _parse_text
+    current = None
+    pos = start
+    while pos < end:
+        newline = buf.find(b"\n", pos, end)
+        line_end = end if newline < 0 else newline + 1
+        line = buf[pos:line_end].rstrip(b"\r\n")
+        if needles and not all(needle in line for needle in needles):
+            if jsonl or _TEXT_RE.match(line):
+                if current is not None:
+                    yield current[0], pos, current[1]
+                current = None
+            pos = line_end
+            continue
+        header = parse(line)
+        if header is not None:
+            if current is not None:
+                yield current[0], pos, current[1]
+            current = (pos, header)
+        pos = line_end
+    if current is not None:
+        yield current[0], end, current[1]
+
+
+# --------------------
+# 索引
+# --------------------
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def load_index(path: str) -> Optional[dict]:
+    try:
+        with open(index_path(path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def _indexed_end(path: str, size: int) -> int:
+    """只索引完整的行：正在写入的最后一行留到下次"""
+    if size == 0:
+        return 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+        return mm.rfind(b"\n") + 1
+
+
+def _update_index(path: str, block_size: int) -> tuple[dict, bool]:
+    """
+    在内存中建立或增量更新索引，返回 (索引, 是否有变化)，不写文件
+    末尾未写满的块与新追加的内容合并重建，反复查询正在写入的文件不会产生大量碎块
+    """
+    st = os.stat(path)
+    index = load_index(path)
+    if index is None or index["inode"] != st.st_ino or index["size"] > st.st_size:
+        index = {"version": INDEX_VERSION, "file": os.path.basename(path), "inode": st.st_ino, "size": 0,
+                 "tags": [], "funcs": [], "blocks": []}
+    start, end = index["size"], _indexed_end(path, st.st_size)
+    if end <= start:
+        return index, False
+    blocks = index["blocks"]
+    if blocks and blocks[-1][1] == start and blocks[-1][1] - blocks[-1][0] < block_size:
+        start = blocks.pop()[0]  # 重新扫描最多 block_size 字节
+
+    tag_ids = {name: i for i, name in enumerate(index["tags"])}
+    func_ids = {name: i for i, name in enumerate(index["funcs"])}
+    block = None
+
+    def _flush(block_end: int) -> None:
+        first, min_ts, max_ts, mask, tags, funcs, max_dur = block
+        index["blocks"].append([first, block_end, min_ts, max_ts, mask, sorted(tags), sorted(funcs), max_dur])
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), end, access=mmap.ACCESS_READ) as mm:
+        for offset, record_end, (ts, level, tag, func, duration, _) in _iter_records(mm, start, end, is_jsonl(path)):
+            if block is None:
+                block = [offset, ts, ts, 0, set(), set(), 0.0]
+            block[1], block[2] = min(block[1], ts), max(block[2], ts)
+            block[3] |= _LEVEL_BITS.get(level, 0)
+            if tag is not None:
+                block[4].add(tag_ids.setdefault(tag, len(tag_ids)))
+            if func is not None:
+                block[5].add(func_ids.setdefault(func, len(func_ids)))
+            if duration is not None:
+                block[6] = max(block[6], duration)
+            if record_end - block[0] >= block_size:
+                _flush(record_end)
+                block = None
+        if block is not None:
+            _flush(end)
+
+    index["tags"] = sorted(tag_ids, key=tag_ids.get)
+    index["funcs"] = sorted(func_ids, key=func_ids.get)
+    index["size"] = end
+    return index, True
+
+
+def _save_index(path: str, index: dict) -> None:
+    tmp = index_path(path) + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, index_path(path))
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def build_index(
+        path: Annotated[str, ParamInfo("Log file / 日志文件")],
+        block_size: Annotated[int, ParamInfo("Target block size in bytes / 目标块大小")] = BLOCK_SIZE
+) -> dict:
+    """Build or incrementally extend the sidecar index of one log file. 建立或增量更新单个文件的索引"""
+    index, changed = _update_index(path, block_size)
+    if changed:
+        _save_index(path, index)
+    return index
+
+
+LOG_FORMATS = ("auto", "jsonl", "text", "all")
+
+
+def log_files(
+        directory: Annotated[str, ParamInfo("Log directory / 日志目录")] = "logs",
+        fmt: Annotated[str, ParamInfo("auto / jsonl / text / all")] = "all"
+) -> list[str]:
+    """
+    *.log / *.jsonl and their rotated copies, oldest first. 日志文件（含已轮转文件）
+
+    LOG_JSONL=1 时同一批记录同时写入 <slug>.log 与 <slug>.jsonl，查询两者会得到重复结果：
+    fmt='auto' 在存在 JSON-lines 日志时只取 *.jsonl，否则取文本日志；'all' 返回两者（建索引用）
+    """
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{fmt}', choose from {list(LOG_FORMATS)}")
+    paths = set(glob.glob(os.path.join(directory, "*.log*")) + glob.glob(os.path.join(directory, "*.jsonl*")))
+    paths = [p for p in paths if not p.endswith((INDEX_SUFFIX, ".tmp", ".gz", ".zip"))]
+    if fmt == "auto":
+        fmt = "jsonl" if any(is_jsonl(p) for p in paths) else "text"
+    if fmt != "all":
+        paths = [p for p in paths if is_jsonl(p) == (fmt == "jsonl")]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def build_indexes(directory: Annotated[str, ParamInfo("Log directory / 日志目录")] = "logs") -> dict[str, int]:
+    """Index every log file in a directory; returns {path: block count}. 为目录下所有日志建立索引"""
+    return {path: len(build_index(path)["blocks"]) for path in log_files(directory)}
+
+
+# --------------------
+# 查询
+# --------------------
+class LogQuery:
+    """
+    查询条件，全部为可选，多个条件同时满足
+
+    Args:
+        tag: 标签，如 'EXCEPTION' / 'TIMER' / 'CALL'
+        func: 函数名
+        min_level: 最低级别，如 'WARNING'
+        since / until: 时间范围（epoch 秒）
+        min_duration: [TIMER] 最小耗时（秒）
+        contains: 消息中包含的子串
+    """
+
+    def __init__(self, tag: Optional[str] = None, func: Optional[str] = None, min_level: Optional[str] = None,
+                 since: Optional[float] = None, until: Optional[float] = None,
+                 min_duration: Optional[float] = None, contains: Optional[str] = None):
+        if min_level is not None and min_level.upper() not in _LEVEL_BITS:
+            raise ValueError(f"Unknown level '{min_level}', choose from {list(LEVELS)}")
+        self.tag = tag.strip("[]").upper() if tag else None
+        self.func = func
+        self.levels = set(LEVELS[LEVELS.index(min_level.upper()):]) if min_level else None
+        self.level_mask = sum(_LEVEL_BITS[name] for name in self.levels) if self.levels else None
+        self.since = since
+        self.until = until
+        self.min_duration = min_duration
+        self.contains = contains
+        # 标签与函数名一定出现在记录首行，先按字节串过滤，避免逐条 JSON / 时间解析
+        self.needles = tuple(needle.encode() for needle in (
+            f"[{self.tag}]" if self.tag else None, func) if needle)
+
+    def match_block(self, block: list, tags: list, funcs: list) -> bool:
+        _, _, min_ts, max_ts, mask, tag_ids, func_ids, max_dur = block
+        if self.since is not None and max_ts < self.since:
+            return False
+        if self.until is not None and min_ts > self.until:
+            return False
+        if self.level_mask is not None and not mask & self.level_mask:
+            return False
+        if self.tag is not None and self.tag not in (tags[i] for i in tag_ids):
+            return False
+        if self.func is not None and self.func not in (funcs[i] for i in func_ids):
+            return False
+        return self.min_duration is None or max_dur >= self.min_duration
+
+    def match(self, record: tuple) -> bool:
+        ts, level, tag, func, duration, message = record
+        return ((self.since is None or ts >= self.since)
+                and (self.until is None or ts <= self.until)
+                and (self.levels is None or level in self.levels)
+                and (self.tag is None or tag == self.tag)
+                and (self.func is None or func == self.func)
+                and (self.min_duration is None or (duration is not None and duration >= self.min_duration))
+                and (self.contains is None or self.contains in message))
+
+
+def _ranges(index: Optional[dict], size: int, query: LogQuery, stats: dict) -> list[tuple[int, int]]:
+    """需要扫描的字节范围：索引命中的块 + 索引之后新追加的部分，均不超过已映射的 size"""
+    if index is None or index["size"] > size:
+        return [(0, size)]
+    blocks = index["blocks"]
+    stats["blocks"] += len(blocks)
+    selected = [(b[0], b[1]) for b in blocks if query.match_block(b, index["tags"], index["funcs"])]
+    stats["blocks_scanned"] += len(selected)
+    if size > index["size"]:
+        selected.append((index["size"], size))
+    return selected
+
+
+def query_logs(
+        query: Annotated[LogQuery, ParamInfo("Filters / 查询条件")],
+        paths: Annotated[Iterable[str] | None, ParamInfo("Log files, default log_files(fmt='auto') / 日志文件")] = None,
+        use_index: Annotated[bool, ParamInfo("False for a linear scan / False 表示全量扫描")] = True,
+        stats: Annotated[dict | None, ParamInfo("Filled with scan statistics / 扫描统计")] = None
+) -> Iterator[tuple[str, dict, str]]:
+    """
+    Yield (path, record fields, raw text) for matching records, using sidecar indexes and mmap reads.
+    使用索引与 mmap 读取返回匹配的记录
+    """
+    stats = stats if stats is not None else {}
+    for key in ("files", "blocks", "blocks_scanned", "bytes_scanned"):
+        stats.setdefault(key, 0)
+    start = time.perf_counter()
+    for path in (log_files(fmt="auto") if paths is None else paths):
+        # 先更新索引再取文件大小：索引覆盖的范围一定在映射范围之内，之后追加的内容本次不读
+        index = None
+        if use_index:
+            index, changed = _update_index(path, BLOCK_SIZE)
+            if changed:
+                try:
+                    _save_index(path, index)
+                except OSError:
+                    pass  # 只读的日志目录等：本次使用内存中的索引，不影响查询
+        jsonl = is_jsonl(path)
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                continue
+            stats["files"] += 1
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                for range_start, range_end in _ranges(index, size, query, stats):
+                    stats["bytes_scanned"] += range_end - range_start
+                    for offset, record_end, record in _iter_records(mm, range_start, range_end, jsonl, query.needles):
+                        if query.match(record):
+                            ts, level, tag, func, duration, message = record
+                            fields = {"ts": ts, "level": level, "tag": tag, "func": func, "dur": duration}
+                            yield path, fields, mm[offset:record_end].decode("utf-8", "replace")
+    stats["elapsed_s"] = time.perf_counter() - start
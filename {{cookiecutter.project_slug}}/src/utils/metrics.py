@@ -0,0 +1,325 @@
+"""
+File: metrics.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: In-process metrics registry (counters, gauges, histograms) with Prometheus/JSON exporters.
+
+进程内指标：Counter / Gauge / Histogram（固定桶），线程安全。
+热路径用法：在装饰/初始化时用 labels(...) 取得子指标并保存，调用时只做一次加锁累加。
+
+    from utils.metrics import REGISTRY
+    calls = REGISTRY.counter("jobs_total", "Jobs processed", ["kind"]).labels("file")
+    calls.inc()
+
+导出：to_prometheus_text() / write_prometheus(path) / start_http_server(port) / dump_json_at_exit(path)
+"""
+import os
+import json
+import atexit
+import threading
+from bisect import bisect_left
+from typing import Any, Annotated, Iterable, Sequence
+
+from .helpers import ParamInfo
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --------------------
+# 子指标（带具体标签值）
+# --------------------
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase / 计数器只能增加")
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = float(value)  # 单次赋值在 GIL 下是原子的
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 最后一个为 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self._bounds + (float("inf"),), counts):
+            cumulative += n
+            buckets[_format_float(bound)] = cumulative
+        return {"buckets": buckets, "sum": total, "count": count}
+
+
+# --------------------
+# 指标族（同名、不同标签值）
+# --------------------
+class _Metric:
+    kind = ""
+    _child_cls: Any = None
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        return self._child_cls()
+
+    def labels(self, *values: Any, **kwargs: Any):
+        """Return (and cache) the child for the given label values. 获取指定标签值的子指标"""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def samples(self) -> list[tuple[dict, Any]]:
+        return [(dict(zip(self.labelnames, key)), child.snapshot()) for key, child in list(self._children.items())]
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _child_cls = _CounterChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    _child_cls = _GaugeChild
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != float("inf")))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+
+# --------------------
+# 注册表
+# --------------------
+class MetricsRegistry:
+    """Thread-safe registry; get-or-create by name. 线程安全的指标注册表，按名字获取或创建"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, *args, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str = "", labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def snapshot(self) -> dict:
+        """JSON-serializable snapshot of all metrics. 所有指标的快照（可 JSON 序列化）"""
+        return {
+            name: {
+                "type": metric.kind,
+                "help": metric.help,
+                "samples": [{"labels": labels, "value": value} for labels, value in metric.samples()],
+            }
+            for name, metric in list(self._metrics.items())
+        }
+
+    def to_prometheus_text(self) -> str:
+        """Render Prometheus text exposition format (0.0.4). 输出 Prometheus 文本格式"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in metric.samples():
+                if metric.kind == "histogram":
+                    for le, count in value["buckets"].items():
+                        lines.append(f"{name}_bucket{_format_labels(labels, le=le)} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_float(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_float(value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _format_float(value: float) -> str:
+    value = float(value)
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict, **extra: str) -> str:
+    items = list(labels.items()) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in items) + "}"
+
+
+# --------------------
+# 导出
+# --------------------
+def write_prometheus(
+        path: Annotated[str, ParamInfo("Output .prom file, e.g. for node_exporter textfile collector / 输出文件")],
+        registry: Annotated[MetricsRegistry, ParamInfo("Registry to export / 导出的注册表")] = REGISTRY
+) -> str:
+    """Atomically write Prometheus text format to a file. 原子写入 Prometheus 文本格式文件"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.to_prometheus_text())
+    os.replace(tmp, path)
+    return path
+
+
+def write_json(
+        path: Annotated[str, ParamInfo("Output JSON file / 输出 JSON 文件")],
+        registry: Annotated[MetricsRegistry, ParamInfo("Registry to export / 导出的注册表")] = REGISTRY
+) -> str:
+    """Write a JSON snapshot of the registry. 写出 JSON 快照"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f, indent=2, ensure_ascii=False)
+    return path
+
+
+def dump_json_at_exit(
+        path: Annotated[str, ParamInfo("Output JSON file / 输出 JSON 文件")],
+        registry: Annotated[MetricsRegistry, ParamInfo("Registry to export / 导出的注册表")] = REGISTRY
+) -> None:
+    """Write a JSON snapshot when the interpreter exits. 进程退出时写出 JSON 快照"""
+    atexit.register(write_json, path, registry)
+
+
+def start_http_server(
+        port: Annotated[int, ParamInfo("Listen port, 0 for random / 监听端口")] = 9100,
+        host: Annotated[str, ParamInfo("Listen address, local only by default / 监听地址（默认仅本机）")] = "127.0.0.1",
+        registry: Annotated[MetricsRegistry, ParamInfo("Registry to export / 导出的注册表")] = REGISTRY
+):
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread. 后台线程提供 /metrics 端点"""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] == "/metrics":
+                body, ctype = registry.to_prometheus_text().encode(), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path.split("?")[0] == "/metrics.json":
+                body, ctype = json.dumps(registry.snapshot()).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
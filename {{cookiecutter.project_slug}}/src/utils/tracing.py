@@ -0,0 +1,295 @@
+"""
+File: tracing.py
+Author: {{ cookiecutter.author_name }}
+Version: {{ cookiecutter.project_version }}
+Date: {{ cookiecutter.date }}
+Description: Lightweight contextvar-based tracing spans with span tree and Chrome trace-event export.
+
+默认关闭：关闭时 span() 返回共享的空对象，开销只有一次全局标志判断。开启后：
+
+    from utils import tracing
+    tracing.enable()
+    with tracing.span("load", path=path):
+        ...
+    print(tracing.format_tree())                 # 每个节点的 total / self 耗时
+    tracing.write_chrome_trace("trace.json")     # chrome://tracing 或 ui.perfetto.dev 打开
+
+当前 span 保存在 ContextVar 中：asyncio 任务自动继承创建者的 span；
+线程不继承上下文，提交到线程/线程池的函数用 tracing.wrap(func) 包装后挂在当前 span 之下。
+每棵树共享一个 trace_id（关联 ID），每个 span 有进程内唯一的 span_id。
+子 span 在开始时即挂到父 span 下：父 span 结束后才结束的子 span（后台线程、未等待的任务）同样保留在树中，
+导出时尚未结束的 span 计到当前时刻并标记 unfinished。
+同一次调用上叠加的装饰器（如 @timer + @log_func_call）通过 call_span() 共用一个 span。
+"""
+import os
+import json
+import time
+import threading
+import itertools
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Annotated, Callable, Iterable, Optional
+
+from .helpers import ParamInfo
+
+MAX_ROOT_SPANS = 10_000  # 长时间运行时只保留最近的根 span，内存有上界
+
+_enabled = False
+_current: ContextVar[Optional["Span"]] = ContextVar("tracing_current_span", default=None)
+_roots: deque = deque(maxlen=MAX_ROOT_SPANS)
+_ids = itertools.count(1)
+_EPOCH = time.perf_counter()
+
+
+class Span:
+    """A timed node in the span tree. 一个计时节点"""
+
+    __slots__ = ("name", "category", "attrs", "parent", "children", "trace_id", "span_id",
+                 "tid", "start", "end", "_token", "_inner")
+
+    def __init__(self, name: str, category: str = "function", attrs: Optional[dict] = None):
+        parent = _current.get()
+        self.name = name
+        self.category = category
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children: list[Span] = []
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(8).hex()
+        self.span_id = next(_ids)
+        self.tid = 0
+        self.start = self.end = 0.0
+        self._token = None
+        self._inner = None  # call_span：下一层装饰器将要调用的函数
+
+    def __enter__(self) -> "Span":
+        self.tid = threading.get_native_id()
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        if self.parent is not None:
+            self.parent.children.append(self)  # 开始时挂到父节点：晚于父节点结束的子节点不会丢失
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.end = time.perf_counter()
+        _current.reset(self._token)
+        self._token = None
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self.parent is None:
+            _roots.append(self)
+        elif self.parent.end and self.end > self.parent.end:
+            self.attrs["after_parent"] = True  # 父节点已结束（后台线程/未等待的任务）
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes, shown in the trace viewer. 附加属性"""
+        self.attrs.update(attrs)
+
+    @property
+    def finished(self) -> bool:
+        return self.end != 0.0
+
+    @property
+    def total(self) -> float:
+        """Wall time in seconds, up to now while unfinished. 总耗时（秒），未结束时计到当前时刻"""
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def self_time(self) -> float:
+        """Total minus children; clamped at 0 for concurrent children. 自身耗时（秒）"""
+        return max(self.total - sum(child.total for child in self.children), 0.0)
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is disabled. 关闭时返回的空 span"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+# --------------------
+# 开关与当前上下文
+# --------------------
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    """Drop all finished root spans. 清空已完成的 span 树"""
+    _roots.clear()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Correlation ID of the current span tree, None outside any span. 当前关联 ID"""
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+# --------------------
+# 创建 span
+# --------------------
+def span(
+        name: Annotated[str, ParamInfo("Span name / span 名称")],
+        category: Annotated[str, ParamInfo("Category shown in trace viewer / 分类")] = "function",
+        **attrs: Any
+):
+    """Context manager opening a child of the current span. 打开当前 span 的子 span"""
+    if not _enabled:
+        return _NOOP
+    return Span(name, category, attrs)
+
+
+def call_span(
+        wrapper: Annotated[Callable, ParamInfo("The calling decorator's wrapper function / 调用方装饰器的包装函数")],
+        func: Annotated[Callable, ParamInfo("Function the wrapper is about to call / 包装函数将要调用的函数")],
+        name: Annotated[str, ParamInfo("Span name / span 名称")],
+        category: Annotated[str, ParamInfo("Category / 分类")] = "function"
+):
+    """
+    Span for one call of a decorated function; stacked decorators on the same call share one span.
+    装饰器使用：同一次调用上叠加的多个装饰器只产生一个 span
+
+    外层装饰器打开 span 并记下将要调用的 func；func 正是内层装饰器的包装函数时，内层直接复用该 span。
+    到达原函数后不再匹配，函数体内的递归调用仍会打开新的 span。
+    """
+    if not _enabled:
+        return _NOOP
+    current = _current.get()
+    if current is not None and current._inner is wrapper:
+        current._inner = func  # 交给再下一层
+        return _NOOP
+    node = Span(name, category)
+    node._inner = func
+    return node
+
+
+def traced(
+        name: Annotated[str | None, ParamInfo("Span name, default function qualname / span 名称")] = None,
+        category: Annotated[str, ParamInfo("Category / 分类")] = "function"
+):
+    """Decorator wrapping each call (sync or async) in a span. 用 span 包裹每次调用，支持 async 函数"""
+    from inspect import iscoroutinefunction  # 不在模块级导入，保持 decorators 的导入开销
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with call_span(async_wrapper, func, span_name, category):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with call_span(wrapper, func, span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def wrap(func: Annotated[Callable, ParamInfo("Function to run in another thread / 在其他线程执行的函数")]) -> Callable:
+    """Bind func to the current span so spans it opens in another thread nest under it. 跨线程传递当前 span"""
+    parent = _current.get()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+
+# --------------------
+# 导出
+# --------------------
+def roots() -> list[Span]:
+    """Finished root spans, oldest first. 已完成的根 span"""
+    return list(_roots)
+
+
+def _walk(spans: Iterable[Span], depth: int = 0):
+    for node in spans:
+        yield depth, node
+        yield from _walk(sorted(node.children, key=lambda s: s.start), depth + 1)
+
+
+def format_tree(
+        spans: Annotated[Iterable[Span] | None, ParamInfo("Root spans, default all / 根 span")] = None,
+        min_ms: Annotated[float, ParamInfo("Hide nodes faster than this / 隐藏耗时更短的节点")] = 0.0
+) -> str:
+    """Render span trees with total/self milliseconds per node. 输出每个节点 total / self 耗时的树"""
+    lines = [f"{'total ms':>10} {'self ms':>10}  span"]
+    for depth, node in _walk(roots() if spans is None else spans):
+        if node.total * 1000 < min_ms:
+            continue
+        tag = f"  [{node.trace_id}]" if depth == 0 else ""
+        lines.append(f"{node.total * 1000:10.3f} {node.self_time * 1000:10.3f}  {'  ' * depth}{node.name} ({node.category}){tag}")
+    return "\n".join(lines)
+
+
+def to_chrome_trace(
+        spans: Annotated[Iterable[Span] | None, ParamInfo("Root spans, default all / 根 span")] = None
+) -> dict:
+    """Chrome trace-event format (complete 'X' events). Chrome trace-event 格式"""
+    pid = os.getpid()
+    events = []
+    for _, node in _walk(roots() if spans is None else spans):
+        events.append({
+            "name": node.name,
+            "cat": node.category,
+            "ph": "X",
+            "ts": (node.start - _EPOCH) * 1e6,
+            "dur": node.total * 1e6,
+            "pid": pid,
+            "tid": node.tid,
+            "args": {
+                "trace_id": node.trace_id,
+                "span_id": node.span_id,
+                "parent_id": node.parent.span_id if node.parent is not None else None,
+                "self_ms": node.self_time * 1000,
+                **({} if node.finished else {"unfinished": True}),
+                **{k: v if isinstance(v, (int, float, bool, str)) or v is None else str(v)
+                   for k, v in node.attrs.items()},
+            },
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(
+        path: Annotated[str, ParamInfo("Output JSON file / 输出 JSON 文件")],
+        spans: Annotated[Iterable[Span] | None, ParamInfo("Root spans, default all / 根 span")] = None
+) -> str:
+    """Write Chrome trace-event JSON. 写出 Chrome trace-event JSON"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(spans), f, ensure_ascii=False)
+    return path